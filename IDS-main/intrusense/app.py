@@ -235,6 +235,20 @@ header[data-testid="stHeader"] * {
 
 create_users_table()
 
+# ---------------- MODEL WARM-UP ----------------
+# Build and warm the detection model once per server process, off the
+# request path, so the first detection does not pay for it.
+@st.cache_resource
+def start_model_warmup():
+    import threading
+    from common.detection_utlis import warm_up
+
+    thread = threading.Thread(target=warm_up, name="ids-model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+start_model_warmup()
+
 # ---------------- LOGIN PAGE ----------------
 # ---------------- LOGIN PAGE ----------------
 import base64
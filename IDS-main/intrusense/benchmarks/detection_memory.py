@@ -0,0 +1,117 @@
+# detection_memory.py
+# Peak resident memory of one offline detection run with float64 versus
+# float32 feature matrices (IDS_FEATURE_DTYPE, see ml/feature_plan.py).
+#
+# Each run happens in a fresh interpreter; "Model RSS" is the high-water
+# mark after loading the model, "Peak RSS" the one after run_detection.
+#
+# Run from the intrusense/ directory:
+#     python benchmarks/detection_memory.py [--rows 1000000] [--csv existing.csv]
+# Without --csv, a synthetic NSL-KDD-shaped CSV is written to a temp file.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+DTYPES = ["float64", "float32"]
+
+PROBE = """
+import json, resource, time
+from common import detection_utlis
+
+detection_utlis.load_artifacts()
+detection_utlis.load_model()
+model_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+start = time.perf_counter()
+df = detection_utlis.run_detection({path!r})
+elapsed = time.perf_counter() - start
+
+peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"rows": len(df), "seconds": elapsed, "model_kb": model_rss, "peak_kb": peak_rss}}))
+"""
+
+
+def write_synthetic_csv(path, rows, chunk=100_000):
+    from common import detection_utlis
+    from ml.feature_plan import build_feature_plan
+
+    plan = build_feature_plan(detection_utlis.load_artifacts()["training_columns"])
+    rng = np.random.default_rng(0)
+
+    import pandas as pd
+
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        df = pd.DataFrame({
+            name: rng.integers(0, 100, n) for name in plan["numeric_names"]
+        })
+        for field, spec in plan["categories"].items():
+            df[field] = rng.choice(np.asarray(spec["values"]), n)
+        df["label"] = "normal"
+
+        df.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+
+def measure(path, dtype):
+    env = dict(os.environ, IDS_FEATURE_DTYPE=dtype)
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE.format(path=path)],
+        cwd=APP_DIR,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        return {"error": lines[-1] if lines else f"exit code {result.returncode}"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--csv", help="Existing CSV to run on instead of synthetic rows")
+    args = parser.parse_args()
+
+    tmp = None
+    path = args.csv
+    if path is None:
+        tmp = tempfile.NamedTemporaryFile(suffix=".csv", delete=False)
+        tmp.close()
+        path = tmp.name
+        print(f"Writing {args.rows:,} synthetic rows to {path} ...")
+        write_synthetic_csv(path, args.rows)
+
+    try:
+        print(f"\n{'Dtype':<10}{'Rows':>12}{'Seconds':>10}{'Model RSS (MB)':>16}{'Peak RSS (MB)':>15}{'Detection (MB)':>16}")
+        print("-" * 79)
+
+        for dtype in DTYPES:
+            res = measure(path, dtype)
+
+            if "error" in res:
+                print(f"{dtype:<10}{'failed':>12}  {res['error']}")
+                continue
+
+            # ru_maxrss is in kilobytes on Linux
+            model_mb = res["model_kb"] / 1024
+            peak_mb = res["peak_kb"] / 1024
+            print(
+                f"{dtype:<10}{res['rows']:>12,}{res['seconds']:>10.2f}"
+                f"{model_mb:>16.1f}{peak_mb:>15.1f}{peak_mb - model_mb:>16.1f}"
+            )
+    finally:
+        if tmp is not None:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
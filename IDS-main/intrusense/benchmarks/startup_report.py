@@ -0,0 +1,96 @@
+# startup_report.py
+# Cold-start import cost of every Streamlit page.
+#
+# Each page's top-level imports are replayed in a fresh interpreter, so the
+# numbers are what a new Streamlit worker pays before the page can render.
+# The "eager ML stack" row replays what importing detection_utlis used to
+# do (import TensorFlow via ml.model, joblib-load the artefacts), for
+# comparison.
+#
+# Run from the intrusense/ directory:
+#     python benchmarks/startup_report.py [--repeat 3]
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_DIR = os.path.join(APP_DIR, "pages")
+
+HEAVY_MODULES = ["tensorflow", "keras", "sklearn", "joblib", "scapy"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+EAGER_STACK = """
+import ml.model
+from common import detection_utlis
+detection_utlis.load_artifacts()
+"""
+
+
+def page_imports(path):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    nodes = [n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(n) for n in nodes)
+
+
+def measure(code, repeat):
+    script = PROBE.format(code=code, heavy=HEAVY_MODULES)
+    runs = []
+
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=APP_DIR,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            return {"error": result.stderr.strip().splitlines()[-1]}
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    return {
+        "seconds": statistics.median(r["seconds"] for r in runs),
+        "heavy": runs[-1]["heavy"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    targets = [
+        (name, page_imports(os.path.join(PAGES_DIR, name)))
+        for name in sorted(os.listdir(PAGES_DIR))
+        if name.endswith(".py")
+    ]
+    targets.append(("eager ML stack (reference)", EAGER_STACK))
+
+    print(f"{'Page':<32}{'Import (s)':>12}  Heavy modules loaded")
+    print("-" * 80)
+
+    for name, code in targets:
+        res = measure(code, args.repeat)
+
+        if "error" in res:
+            print(f"{name:<32}{'failed':>12}  {res['error']}")
+        else:
+            heavy = ", ".join(res["heavy"]) or "-"
+            print(f"{name:<32}{res['seconds']:>12.3f}  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# student_latency.py
+# Per-event latency and batch throughput of the distilled student against
+# the BiLSTM teacher, with their prediction agreement.
+#
+# Run from the intrusense/ directory after ml/distill.py:
+#     python benchmarks/student_latency.py [labelled.csv] [--events 2000]
+# Without a CSV, random standard-normal rows stand in for scaled features.
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import detection_utlis
+
+
+def per_event_latency(model, X, events):
+    timings = []
+    for i in range(events):
+        row = X[i % len(X)][np.newaxis, np.newaxis, :]
+        start = time.perf_counter()
+        model.predict(row, verbose=0)
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    return {
+        "p50_ms": statistics.median(timings) * 1000,
+        "p99_ms": timings[int(len(timings) * 0.99) - 1] * 1000,
+    }
+
+
+def batch_throughput(model, X):
+    start = time.perf_counter()
+    probs = model.predict(X[:, np.newaxis, :], verbose=0)
+    elapsed = time.perf_counter() - start
+    return probs, len(X) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("csv", nargs="?")
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    if not os.path.exists(detection_utlis.STUDENT_PATH):
+        sys.exit(f"{detection_utlis.STUDENT_PATH} not found; run python -m ml.distill first")
+
+    artifacts = detection_utlis.load_artifacts()
+    y = None
+
+    if args.csv:
+        from ml.preprocessing import load_and_preprocess
+
+        X, y, _, _, _ = load_and_preprocess(
+            args.csv,
+            training=False,
+            scaler=artifacts["scaler"],
+            label_encoder=artifacts["label_encoder"],
+            training_columns=artifacts["training_columns"]
+        )
+    else:
+        rng = np.random.default_rng(0)
+        X = rng.standard_normal((args.rows, len(artifacts["training_columns"])))
+
+    X = X.astype(np.float32)
+
+    print(f"{'Model':<10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'Rows/s':>14}{'Agreement':>12}{'Accuracy':>10}")
+    print("-" * 66)
+
+    teacher_preds = None
+
+    for role in ("teacher", "student"):
+        model = detection_utlis.load_model(role)
+
+        latency = per_event_latency(model, X, args.events)
+        probs, rows_per_second = batch_throughput(model, X)
+        preds = probs.argmax(axis=1)
+
+        if teacher_preds is None:
+            teacher_preds = preds
+
+        agreement = float(np.mean(preds == teacher_preds))
+        accuracy = f"{float(np.mean(preds == y)):.4f}" if y is not None else "-"
+
+        print(
+            f"{role:<10}{latency['p50_ms']:>10.3f}{latency['p99_ms']:>10.3f}"
+            f"{rows_per_second:>14,.0f}{agreement:>12.4f}{accuracy:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
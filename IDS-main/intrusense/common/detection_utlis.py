@@ -1,12 +1,17 @@
-import pandas as pd
 import numpy as np
-import joblib
-import tempfile
+import io
 import os
 import time
+import hashlib
+import threading
+import warnings
+from contextlib import nullcontext
 
-from ml.preprocessing import load_and_preprocess
-from ml.model import build_bilstm
+# Severity helpers live in common/severity.py so that pages can use them
+# without importing this module's ML stack; re-exported for old callers.
+from common.severity import detect_severity
+from common.prediction_cache import prediction_cache, cached_predict
+from common.metrics import track
 
 
 # =================================================
@@ -19,31 +24,251 @@ MODEL_PATH = os.path.join(PROJECT_ROOT, "bilstm_ids.weights.h5")
 ENCODER_PATH = os.path.join(PROJECT_ROOT, "label_encoder.pkl")
 SCALER_PATH = os.path.join(PROJECT_ROOT, "scaler.pkl")
 COLUMNS_PATH = os.path.join(PROJECT_ROOT, "training_columns.pkl")
+CASCADE_PATH = os.path.join(PROJECT_ROOT, "cascade_stage1.pkl")
+STUDENT_PATH = os.path.join(PROJECT_ROOT, "student_ids.npz")
+
+# Single memory-mapped bundle built by ml/bundle.py (weights, scaler,
+# label classes, columns). Used instead of the loose files above when present.
+BUNDLE_PATH = os.path.join(PROJECT_ROOT, "ids_model.bundle")
+
+# "keras" builds the TensorFlow model, "numpy" runs ml/numpy_model.py
+# straight from the same weights file without importing TensorFlow.
+INFERENCE_BACKEND = os.environ.get("IDS_INFERENCE_BACKEND", "keras").lower()
+
+# Route in-process predictions through the shared batching thread in
+# common/inference_server.py ("0" predicts directly in the caller's thread)
+USE_INFERENCE_SERVER = os.environ.get("IDS_INFERENCE_SERVER", "1") != "0"
+
+# Score rows with the stage-1 classifier from ml/cascade.py first and only
+# send uncertain ones to the BiLSTM (needs cascade_stage1.pkl from train.py)
+USE_CASCADE = os.environ.get("IDS_CASCADE", "0") == "1"
+
+# Model used for stream/live scoring: the distilled "student" from
+# ml/distill.py when it has been trained, otherwise the BiLSTM "teacher".
+# Offline jobs always use the teacher.
+STREAM_MODEL = os.environ.get("IDS_STREAM_MODEL", "student").lower()
+
+# Optional weight quantization for the numpy backend: "float16" or "int8"
+INFERENCE_QUANTIZATION = os.environ.get("IDS_INFERENCE_QUANTIZATION") or None
 
 # =================================================
-# LOAD PREPROCESSING OBJECTS
+# LOAD PREPROCESSING OBJECTS (LAZY)
 # =================================================
-scaler = joblib.load(SCALER_PATH)
-label_encoder = joblib.load(ENCODER_PATH)
-training_columns = joblib.load(COLUMNS_PATH)
+# Loaded on first inference, not at import time, so importing this module
+# stays cheap. The old module attributes still resolve via __getattr__.
+# The published dict is never modified: a (re)load builds a complete new
+# one and swaps it in with a single assignment, so a caller holding a
+# snapshot keeps a consistent scaler/encoder/columns set for its request.
+_artifacts_lock = threading.Lock()
+_artifacts = None
+
+
+def _read_artifacts():
+    import joblib
+
+    if os.path.exists(BUNDLE_PATH):
+        from ml.bundle import read_bundle
+
+        bundle = read_bundle(BUNDLE_PATH)
+        artifacts = {
+            "scaler": bundle["scaler"],
+            "label_encoder": bundle["label_encoder"],
+            "training_columns": bundle["training_columns"],
+            "bundle": bundle,
+        }
+    else:
+        artifacts = {
+            "scaler": joblib.load(SCALER_PATH),
+            "label_encoder": joblib.load(ENCODER_PATH),
+            "training_columns": joblib.load(COLUMNS_PATH),
+            "bundle": None,
+        }
+
+    artifacts["num_classes"] = len(artifacts["label_encoder"].classes_)
+    artifacts["cascade_stage1"] = joblib.load(CASCADE_PATH) if os.path.exists(CASCADE_PATH) else None
+
+    return artifacts
+
+
+def load_artifacts():
+    global _artifacts
+
+    artifacts = _artifacts
+    if artifacts is None:
+        with _artifacts_lock:
+            if _artifacts is None:
+                _artifacts = _read_artifacts()
+            artifacts = _artifacts
+
+    return artifacts
+
+
+def reload_artifacts():
+    global _artifacts
+
+    with _artifacts_lock:
+        _artifacts = _read_artifacts()
+        return _artifacts
 
-num_classes = len(label_encoder.classes_)
+
+def __getattr__(name):
+    if name in ("scaler", "label_encoder", "training_columns", "num_classes"):
+        return load_artifacts()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # =================================================
 # LOAD MODEL SAFELY
 # ================================================
-def load_model():
-    input_shape = (1, len(training_columns))
+def _build_model(artifacts, role="teacher"):
+    if role == "student":
+        from ml.numpy_model import NumpyMLP
+        return NumpyMLP.from_file(STUDENT_PATH)
+
+    bundle = artifacts["bundle"]
+
+    if INFERENCE_BACKEND == "numpy":
+        from ml.numpy_model import NumpyBiLSTM
+        if bundle is not None:
+            # Kernels stay memory-mapped unless quantization copies them
+            return NumpyBiLSTM(bundle["weights"], INFERENCE_QUANTIZATION)
+        return NumpyBiLSTM.from_weights_file(MODEL_PATH, INFERENCE_QUANTIZATION)
+
+    if INFERENCE_BACKEND != "keras":
+        raise ValueError(f"Unknown inference backend: {INFERENCE_BACKEND}")
+
+    if INFERENCE_QUANTIZATION:
+        raise ValueError("Quantized inference requires IDS_INFERENCE_BACKEND=numpy")
 
-    model = build_bilstm(input_shape, num_classes)
+    from ml.model import build_bilstm, CompiledPredictor
+
+    input_shape = (1, len(artifacts["training_columns"]))
+
+    model = build_bilstm(input_shape, artifacts["num_classes"])
 
     # Force layer creation
     model.build((None, *input_shape))
 
-    model.load_weights(MODEL_PATH)
+    if bundle is not None:
+        from ml.numpy_model import WEIGHT_KEYS
+        model.set_weights([bundle["weights"][key] for key in WEIGHT_KEYS])
+    else:
+        model.load_weights(MODEL_PATH)
+
+    # Fixed-signature compiled function, traced once now so the first
+    # real request does not pay for it
+    predictor = CompiledPredictor(model, input_shape[-1])
+    predictor.warm_up()
+
+    return predictor
+
+
+# =================================================
+# PROCESS-WIDE MODEL CACHE
+# =================================================
+# One model per role and process, shared by every Streamlit session and
+# page. The weights file is re-checked on each call: a changed mtime/size
+# triggers a hash, and only a changed hash triggers a rebuild. Each entry
+# holds a (model, artifacts) snapshot tuple, replaced as a whole, so a
+# request never pairs new weights with an old label encoder or vice versa.
+MODEL_ROLES = {
+    "teacher": MODEL_PATH,
+    "student": STUDENT_PATH,
+}
+
+
+def _role_path(role):
+    # The bundle, when present, is the teacher's single source of truth
+    if role == "teacher" and os.path.exists(BUNDLE_PATH):
+        return BUNDLE_PATH
+    return MODEL_ROLES[role]
+
+_model_lock = threading.Lock()
+_model_cache = {
+    role: {"snapshot": None, "stat": None, "sha256": None}
+    for role in MODEL_ROLES
+}
 
-    return model
+
+def _weights_stat(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _weights_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_snapshot(role="teacher"):
+    # (model, artifacts) built together; callers keep it for the whole request
+    path = _role_path(role)
+    entry = _model_cache[role]
+
+    stat = _weights_stat(path)
+
+    # Fast path: nothing changed on disk since the last load
+    snapshot = entry["snapshot"]
+    if snapshot is not None and entry["stat"] == stat:
+        return snapshot
+
+    with _model_lock:
+        stat = _weights_stat(path)
+
+        if entry["snapshot"] is not None and entry["stat"] == stat:
+            return entry["snapshot"]
+
+        sha256 = _weights_sha256(path)
+
+        if entry["snapshot"] is None or entry["sha256"] != sha256:
+            # A new bundle also carries a new scaler/encoder/columns
+            if path == BUNDLE_PATH and entry["sha256"] is not None:
+                artifacts = reload_artifacts()
+            else:
+                artifacts = load_artifacts()
+
+            entry["snapshot"] = (_build_model(artifacts, role), artifacts)
+            entry["sha256"] = sha256
+
+            # Cached outputs belong to the previous weights
+            prediction_cache.clear()
+
+        # Touched but identical weights only refresh the stat
+        entry["stat"] = stat
+
+        return entry["snapshot"]
+
+
+def load_model(role="teacher"):
+    return load_snapshot(role)[0]
+
+
+def clear_model_cache():
+    with _model_lock:
+        for entry in _model_cache.values():
+            entry["snapshot"] = None
+            entry["stat"] = None
+            entry["sha256"] = None
+
+        prediction_cache.clear()
+
+
+def warm_up():
+    # Called once per server process from app.py, in the background
+    load_artifacts()
+    load_model()
+    if stream_model_role() == "student":
+        load_model("student")
+
+
+def stream_model_role():
+    # Student for stream/live scoring when configured and trained
+    if STREAM_MODEL == "student" and os.path.exists(STUDENT_PATH):
+        return "student"
+    return "teacher"
 
 
 
@@ -51,116 +276,367 @@ def load_model():
 
 
 # =================================================
-# SEVERITY LOGIC
+# PREDICTION
 # =================================================
-def detect_severity(attack):
-    attack = str(attack).lower()
-
-    if attack == "normal":
-        return "Low"
-    elif attack in ["probe"]:
-        return "Medium"
-    elif attack in ["dos", "r2l", "u2r"]:
-        return "High"
-    else:
-        return "Medium"
+def _no_stage(name):
+    return nullcontext()
+
+
+def predict_proba(X, model=None, workers=None, role="teacher"):
+    # workers > 1 scores big matrices in a process pool (see
+    # common/parallel_inference.py); otherwise predict in this process,
+    # batched with other sessions' requests by the inference server.
+    # The student is cheap enough to always run in the caller's thread.
+    if X.ndim == 2:
+        X = np.expand_dims(X, axis=1)
+
+    if role != "teacher":
+        return (model or load_model(role)).predict(X, verbose=0)
+
+    if workers and workers > 1:
+        from common.parallel_inference import PARALLEL_MIN_ROWS, predict_sharded
+
+        if len(X) >= PARALLEL_MIN_ROWS:
+            return predict_sharded(X, load_artifacts()["num_classes"], workers)
+
+    if USE_INFERENCE_SERVER:
+        return submit_prediction(X, model).result()
+
+    if model is None:
+        model = load_model()
+
+    return model.predict(X, verbose=0)
+
+
+def _server_predict(model, X):
+    # Runs on the inference server thread with the caller's snapshot model;
+    # requests without one get the current model (load_model keeps hot reload)
+    if model is None:
+        model = load_model()
+    return model.predict(X, verbose=0)
+
+
+def submit_prediction(X, model=None):
+    # Queue X on the shared inference server and return a Future
+    from common.inference_server import get_inference_server
+
+    if X.ndim == 2:
+        X = np.expand_dims(X, axis=1)
+
+    return get_inference_server(_server_predict).submit(X, model)
+
+
+def unique_rows(X):
+    # Rows are compared byte-for-byte through a void view, which is much
+    # cheaper than np.unique(axis=0) on wide float matrices.
+    X = np.ascontiguousarray(X.reshape(len(X), -1))
+    rows = X.view(np.dtype((np.void, X.dtype.itemsize * X.shape[1]))).ravel()
+
+    _, index, inverse = np.unique(rows, return_index=True, return_inverse=True)
+
+    return X[index], inverse.ravel()
+
+
+def predict_unique(X, model=None, workers=None, timer=None, cascade=None, artifacts=None):
+    # Identical connection records (SYN floods, smurf) are scored once and
+    # the probabilities broadcast back through the inverse index.
+    if len(X) == 0:
+        return predict_proba(X, model, workers), {"rows": 0, "unique_rows": 0, "dedup_ratio": 1.0}
+
+    stage = timer.stage if timer is not None else _no_stage
+
+    with stage("dedup"):
+        X_unique, inverse = unique_rows(X)
+
+    def full_predict(rows):
+        return cached_predict(rows, lambda batch: predict_proba(batch, model, workers))
+
+    stats = {
+        "rows": int(len(X)),
+        "unique_rows": int(len(X_unique)),
+        "dedup_ratio": round(len(X) / len(X_unique), 3),
+    }
+
+    if artifacts is None:
+        artifacts = load_artifacts()
+
+    stage1 = None
+    if USE_CASCADE if cascade is None else cascade:
+        stage1 = artifacts["cascade_stage1"]
+        if stage1 is None:
+            warnings.warn(
+                f"Cascade requested but {CASCADE_PATH} was not found; scoring every row with the full model",
+                stacklevel=2
+            )
+
+    with stage("predict"):
+        if stage1 is not None:
+            from ml.cascade import cascade_predict
+
+            preds, cascade_stats = cascade_predict(stage1, X_unique, full_predict, artifacts["num_classes"])
+            stats.update(cascade_stats)
+        else:
+            preds = full_predict(X_unique)
+
+    return preds[inverse], stats
 
 
 # =================================================
 # OFFLINE DETECTION
 # =================================================
-def run_detection(file_input):
+def run_detection(file_input, workers=None, cascade=None):
 
-    model = load_model()
+    from ml.preprocessing import load_and_preprocess, read_frame
 
-    # Handle UploadedFile or bytes
-    if isinstance(file_input, bytes):
-        file_bytes = file_input
-    else:
-        file_bytes = file_input.getvalue()
+    # Stage timings and row counts go to common.metrics for the admin panel
+    with track("run_detection") as timer:
 
-    # Save temp CSV
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp:
-        tmp.write(file_bytes)
-        temp_path = tmp.name
+        with timer.stage("load_model"):
+            model, artifacts = load_snapshot()
+        label_encoder = artifacts["label_encoder"]
 
-    df = pd.read_csv(temp_path)
+        # Parse the upload (UploadedFile, bytes or path) once, in memory; the
+        # same frame feeds preprocessing and the annotated output, so the
+        # user's non-feature columns are kept.
+        with timer.stage("parse"):
+            df = read_frame(file_input, training_columns=artifacts["training_columns"], keep_columns=True)
+            if df is file_input:
+                df = df.copy()
 
-    X, _, _, _, _ = load_and_preprocess(
-        filepath=temp_path,
-        training=False,
-        has_header=True,
-        scaler=scaler,
-        label_encoder=label_encoder,
-        training_columns=training_columns
-    )
+        timer.rows = len(df)
 
-    os.remove(temp_path)
+        X, _, _, _, _ = load_and_preprocess(
+            filepath=df,
+            training=False,
+            mode="inference",
+            has_header=True,
+            scaler=artifacts["scaler"],
+            label_encoder=label_encoder,
+            training_columns=artifacts["training_columns"],
+            stage=timer.stage
+        )
 
-    if X.ndim == 2:
-        X = np.expand_dims(X, axis=1)
+        preds, dedup_stats = predict_unique(X, model, workers, timer, cascade, artifacts)
 
-    preds = model.predict(X, verbose=0)
+        with timer.stage("inverse_transform"):
+            pred_classes = np.argmax(preds, axis=1)
+            pred_labels = label_encoder.inverse_transform(pred_classes)
+            confidence = np.max(preds, axis=1)
 
-    pred_classes = np.argmax(preds, axis=1)
-    pred_labels = label_encoder.inverse_transform(pred_classes)
-    confidence = np.max(preds, axis=1)
+        df["Predicted_Attack"] = pred_labels
+        df["Confidence"] = confidence.round(3)
 
-    df["Predicted_Attack"] = pred_labels
-    df["Confidence"] = confidence.round(3)
-    df["Severity"] = df["Predicted_Attack"].apply(detect_severity)
+        with timer.stage("severity"):
+            df["Severity"] = df["Predicted_Attack"].apply(detect_severity)
+
+        df.attrs["detection_metrics"] = dedup_stats
 
     return df
 
 
 # =================================================
-# LIVE STREAM DETECTION
+# CHUNKED OFFLINE DETECTION (BOUNDED MEMORY)
 # =================================================
-def stream_detection(file_input, delay=1, start_index=0):
+DETECTION_CHUNK_SIZE = 50_000
 
-    model = load_model()
 
-    # Handle UploadedFile or bytes
+def _open_csv_source(file_input):
+    # Paths and file-like objects (Streamlit's UploadedFile included) are
+    # handed to pandas as-is so the upload is never copied with getvalue().
     if isinstance(file_input, bytes):
-        file_bytes = file_input
-    else:
-        file_bytes = file_input.getvalue()
+        return io.BytesIO(file_input), len(file_input)
+
+    if isinstance(file_input, (str, os.PathLike)):
+        return open(file_input, "rb"), os.path.getsize(file_input)
+
+    total = getattr(file_input, "size", None)
+    if hasattr(file_input, "seek"):
+        file_input.seek(0)
+    return file_input, total
+
+
+def _source_position(source):
+    try:
+        return source.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def iter_detection_chunks(file_input, chunksize=DETECTION_CHUNK_SIZE, progress_callback=None, workers=None, cascade=None, stable_dtypes=False):
+    from ml.preprocessing import preprocess_features
+    from ml.ingest import is_parquet, parquet_num_rows, read_typed
+
+    model, artifacts = load_snapshot()
+    label_encoder = artifacts["label_encoder"]
+
+    source, total_bytes = _open_csv_source(file_input)
+    rows_done = 0
+
+    # Parquet progress comes from the row count in its footer, CSV progress
+    # from the byte position of the parser
+    total_rows = parquet_num_rows(source) if is_parquet(source) else None
+    reader = None
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp:
-        tmp.write(file_bytes)
-        temp_path = tmp.name
+    try:
+        # Stage times accumulate over all chunks into one recorded call;
+        # the total also covers time the consumer spends between chunks.
+        with track("run_detection_chunked") as timer:
+            reader = read_typed(source, artifacts["training_columns"], chunksize=chunksize, keep_columns=True, stable_dtypes=stable_dtypes)
 
-    df = pd.read_csv(temp_path)
+            while True:
+                with timer.stage("parse"):
+                    chunk = next(reader, None)
+                if chunk is None:
+                    break
 
-    X, _, _, _, _ = load_and_preprocess(
-        filepath=temp_path,
-        training=False,
-        has_header=True,
-        scaler=scaler,
-        label_encoder=label_encoder,
-        training_columns=training_columns
-    )
+                X = preprocess_features(chunk, artifacts["scaler"], artifacts["training_columns"], stage=timer.stage)
 
-    os.remove(temp_path)
+                preds, dedup_stats = predict_unique(X, model, workers, timer, cascade, artifacts)
+                chunk.attrs["detection_metrics"] = dedup_stats
+
+                with timer.stage("inverse_transform"):
+                    chunk["Predicted_Attack"] = label_encoder.inverse_transform(np.argmax(preds, axis=1))
+                    chunk["Confidence"] = np.max(preds, axis=1).round(3)
+                with timer.stage("severity"):
+                    chunk["Severity"] = chunk["Predicted_Attack"].apply(detect_severity)
+
+                rows_done += len(chunk)
+                timer.rows = rows_done
+
+                if progress_callback is not None:
+                    position = _source_position(source)
+                    fraction = None
+                    if total_rows:
+                        fraction = min(rows_done / total_rows, 1.0)
+                    elif position is not None and total_bytes:
+                        fraction = min(position / total_bytes, 1.0)
+                    progress_callback(rows_done, fraction)
+
+                yield chunk
+
+    finally:
+        # The chunk reader still holds the source: close it first, also
+        # when the consumer stopped early or a chunk raised
+        if reader is not None:
+            reader.close()
+
+        # Only close handles opened here from a path
+        if isinstance(file_input, (str, os.PathLike)):
+            source.close()
+
+
+def run_detection_chunked(file_input, sink, chunksize=DETECTION_CHUNK_SIZE, progress_callback=None, workers=None, cascade=None):
+    # sink: output path (written chunk by chunk; ".parquet" is written as
+    # Parquet row groups, anything else as CSV) or a callable taking each
+    # annotated chunk. Only one chunk is held in memory at a time.
+    summary = {"rows": 0, "chunks": 0, "unique_rows": 0, "attack_counts": {}}
+
+    parquet_sink = None
+    if not callable(sink) and str(sink).endswith(".parquet"):
+        from ml.ingest import ParquetSink
+        parquet_sink = ParquetSink(sink)
+
+    with parquet_sink or nullcontext():
+        # Parquet output needs the same column types in every chunk
+        for chunk in iter_detection_chunks(file_input, chunksize, progress_callback, workers, cascade,
+                                           stable_dtypes=parquet_sink is not None):
+
+            if callable(sink):
+                sink(chunk)
+            elif parquet_sink is not None:
+                parquet_sink.write(chunk)
+            else:
+                chunk.to_csv(sink, mode="w" if summary["chunks"] == 0 else "a",
+                             header=summary["chunks"] == 0, index=False)
+
+            summary["rows"] += len(chunk)
+            summary["chunks"] += 1
+            summary["unique_rows"] += chunk.attrs["detection_metrics"]["unique_rows"]
+
+            for attack, count in chunk["Predicted_Attack"].value_counts().items():
+                summary["attack_counts"][attack] = summary["attack_counts"].get(attack, 0) + int(count)
+
+    # Duplicates are only collapsed within a chunk
+    summary["dedup_ratio"] = round(summary["rows"] / summary["unique_rows"], 3) if summary["unique_rows"] else 1.0
+
+    return summary
+
+
+# =================================================
+# LIVE STREAM DETECTION
+# =================================================
+STREAM_BATCH_SIZE = 256
+STREAM_MAX_LATENCY = 1.0   # seconds a row may wait for its window
+
+
+def _stream_window_size(delay, batch_size, max_latency):
+    # With pacing, row k of a window is shown k * delay seconds after the
+    # window was predicted, so the window must fit inside max_latency.
+    if batch_size <= 1:
+        return 1
+    if delay and delay > 0:
+        return max(1, min(batch_size, int(max_latency / delay) + 1))
+    return batch_size
+
+
+def stream_detection(file_input, delay=1, start_index=0,
+                     batch_size=STREAM_BATCH_SIZE, max_latency=STREAM_MAX_LATENCY):
+
+    from ml.preprocessing import load_and_preprocess, read_frame
+
+    # Setup and each window are timed separately: the generator's own
+    # lifetime is dominated by the pacing sleeps.
+    with track("stream_detection_setup") as timer:
+
+        role = stream_model_role()
+
+        with timer.stage("load_model"):
+            model, artifacts = load_snapshot(role)
+        label_encoder = artifacts["label_encoder"]
+
+        with timer.stage("parse"):
+            df = read_frame(file_input, training_columns=artifacts["training_columns"])
+
+        X, _, _, _, _ = load_and_preprocess(
+            filepath=df,
+            training=False,
+            mode="inference",
+            has_header=True,
+            scaler=artifacts["scaler"],
+            label_encoder=label_encoder,
+            training_columns=artifacts["training_columns"],
+            stage=timer.stage
+        )
+
+        timer.rows = len(X)
 
     if X.ndim == 2:
         X = np.expand_dims(X, axis=1)
 
-    for i in range(start_index, len(X)):
+    window = _stream_window_size(delay, batch_size, max_latency)
 
-        row_X = X[i:i + 1]
+    for start in range(start_index, len(X), window):
 
-        preds = model.predict(row_X, verbose=0)
+        with track("stream_detection_window") as timer:
+            rows = X[start:start + window]
+            timer.rows = len(rows)
 
-        pred_class = np.argmax(preds, axis=1)[0]
-        pred_label = label_encoder.inverse_transform([pred_class])[0]
-        confidence = float(np.max(preds))
+            # One predict call per window instead of per row
+            with timer.stage("predict"):
+                preds = cached_predict(rows, lambda batch: predict_proba(batch, model, role=role), namespace=role)
 
-        yield {
-            "row": i + 1,
-            "prediction": pred_label,
-            "confidence": round(confidence, 3),
-            "severity": detect_severity(pred_label)
-        }
+            with timer.stage("inverse_transform"):
+                pred_classes = np.argmax(preds, axis=1)
+                pred_labels = label_encoder.inverse_transform(pred_classes)
+                confidences = np.max(preds, axis=1)
+
+        for offset, (pred_label, confidence) in enumerate(zip(pred_labels, confidences)):
+
+            yield {
+                "row": start + offset + 1,
+                "prediction": pred_label,
+                "confidence": round(float(confidence), 3),
+                "severity": detect_severity(pred_label)
+            }
 
-        time.sleep(delay)
+            time.sleep(delay)
@@ -0,0 +1,153 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+# =================================================
+# SETTINGS
+# =================================================
+MAX_BATCH_ROWS = 8192   # stop coalescing once a batch reaches this size
+MAX_WAIT = 0.005        # seconds the first request waits for company
+
+
+# =================================================
+# SHARED INFERENCE SERVER
+# =================================================
+# One worker thread per process owns all model calls. Requests from every
+# Streamlit session are queued, coalesced into one batch under a short
+# deadline, predicted together and handed back through futures.
+#
+# Each request may carry the model object its caller holds, and only
+# requests for the same model share a batch: a request that started before
+# a hot reload is still scored by the weights it was preprocessed for.
+# predict_fn(model, X) receives that model, or None for "current model".
+class InferenceServer:
+
+    def __init__(self, predict_fn, max_batch_rows=MAX_BATCH_ROWS, max_wait=MAX_WAIT):
+        self.predict_fn = predict_fn
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait
+
+        self._queue = queue.Queue()
+        self._pending = None   # request for another model, opens the next batch
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.batches = 0
+        self.rows = 0
+        self.largest_batch = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="ids-inference-server", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def submit(self, X, model=None):
+        future = Future()
+        self._queue.put((model, np.asarray(X), future))
+        return future
+
+    def predict(self, X, model=None):
+        return self.submit(X, model).result()
+
+    def _collect(self, first):
+        model = first[0]
+        batch = [first]
+        rows = len(first[1])
+        deadline = time.monotonic() + self.max_wait
+
+        while rows < self.max_batch_rows:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Let the main loop see the stop signal after this batch
+                self._queue.put(None)
+                break
+            if item[0] is not model:
+                self._pending = item
+                break
+            batch.append(item)
+            rows += len(item[1])
+
+        return model, batch
+
+    def _run(self):
+        while True:
+            first, self._pending = self._pending, None
+            if first is None:
+                first = self._queue.get()
+            if first is None:
+                break
+
+            model, batch = self._collect(first)
+            futures = [future for _, _, future in batch]
+
+            try:
+                X = np.concatenate([x for _, x, _ in batch], axis=0)
+                preds = self.predict_fn(model, X)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for _, x, future in batch:
+                future.set_result(preds[offset:offset + len(x)])
+                offset += len(x)
+
+            self.requests += len(batch)
+            self.batches += 1
+            self.rows += len(X)
+            self.largest_batch = max(self.largest_batch, len(X))
+
+    def stats(self):
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "queued": self._queue.qsize(),
+            "requests": self.requests,
+            "batches": self.batches,
+            "rows": self.rows,
+            "largest_batch": self.largest_batch,
+            "avg_requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+_server_lock = threading.Lock()
+_server = {"instance": None}
+
+
+def get_inference_server(predict_fn=None):
+    # predict_fn is only used the first time, when the server is created
+    with _server_lock:
+        if _server["instance"] is None:
+            if predict_fn is None:
+                raise RuntimeError("Inference server has not been created yet")
+            _server["instance"] = InferenceServer(predict_fn)
+        return _server["instance"].start()
+
+
+def server_stats():
+    with _server_lock:
+        server = _server["instance"]
+    return server.stats() if server is not None else None
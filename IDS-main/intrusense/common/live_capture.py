@@ -1,11 +1,24 @@
-from scapy.all import sniff, IP, TCP, UDP
+from scapy.all import AsyncSniffer, IP, TCP, UDP
 import random
+import threading
 import time
+from collections import deque
 from common.feature_template import base_feature_vector
-from ml.preprocessing import map_attack
+from ml.preprocessing import map_attack, ATTACK_LABELS
 
 
-def live_packet_stream():
+# =================================================
+# CAPTURE SETTINGS
+# =================================================
+# One capture socket stays open for the whole stream; packets are turned
+# into events on the sniffer thread and parked in a ring buffer. When the
+# consumer falls behind, the oldest events are dropped first.
+CAPTURE_BUFFER_SIZE = 10_000
+CAPTURE_BATCH_SIZE = 64       # events moved out of the buffer per drain
+CAPTURE_POLL_TIMEOUT = 1.0    # seconds to wait for traffic before re-checking
+
+
+def live_packet_stream(buffer_size=CAPTURE_BUFFER_SIZE, batch_size=CAPTURE_BATCH_SIZE, poll_timeout=CAPTURE_POLL_TIMEOUT):
     packet_no = 0
     start_times = {}   # flow start time
     byte_counts = {}   # src/dst bytes
@@ -190,29 +203,8 @@ def live_packet_stream():
                 "warezclient", "warezmaster", "multihop", "phf", "spy"
             ])
             
-        elif attack_category == "Probe":
-            raw_attack = random.choice([
-                "satan", "ipsweep", "portsweep", "nmap", "mscan", "saint"
-            ])
-            
-        elif attack_category == "DoS":
-            raw_attack = random.choice([
-                "neptune", "smurf", "teardrop", "pod", "land", "back",
-                "apache2", "processtable", "udpstorm", "mailbomb"
-            ])
-            
-        elif attack_category == "R2L":
-            raw_attack = random.choice([
-                "ftp_write", "imap", "multihop", "phf", "spy",
-                "warezclient", "warezmaster", "sendmail", "named", 
-                "snmpgetattack", "snmpguess", "worm", "xlock", "xsnoop"
-            ])
-            
-        elif attack_category == "U2R":
-            raw_attack = random.choice([
-                "buffer_overflow", "loadmodule", "perl", "rootkit", 
-                "sqlattack", "xterm", "ps", "guess_passwd"
-            ])
+        else:
+            raw_attack = random.choice(ATTACK_LABELS[attack_category])
 
         attack_class = map_attack(raw_attack)
 
@@ -247,8 +239,37 @@ def live_packet_stream():
     # -----------------------------
     # 9️⃣ Live sniff loop
     # -----------------------------
-    while True:
-        packet = sniff(count=1, timeout=1)[0]  # Added timeout to prevent hanging
+    buffer = deque(maxlen=buffer_size)
+    event_ready = threading.Event()
+
+    def on_packet(packet):
+        # Runs on the sniffer thread; timings and flow state stay accurate
+        # even while the consumer is busy
         event = process_packet(packet)
         if event:
-            yield event
+            buffer.append(event)
+            event_ready.set()
+
+    sniffer = AsyncSniffer(store=False, prn=on_packet)
+    sniffer.start()
+
+    try:
+        while True:
+            event_ready.clear()
+
+            if not buffer:
+                if not sniffer.thread.is_alive():
+                    error = getattr(sniffer, "exception", None)
+                    raise RuntimeError(f"Packet capture stopped: {error}") from error
+
+                # Quiet network: wait for traffic instead of spinning
+                event_ready.wait(poll_timeout)
+                continue
+
+            batch = [buffer.popleft() for _ in range(min(batch_size, len(buffer)))]
+            yield from batch
+
+    finally:
+        # Also runs when the page drops or closes the generator
+        if sniffer.running:
+            sniffer.stop()
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+
+# =================================================
+# SETTINGS
+# =================================================
+RECENT_CALLS = 200   # calls kept per pipeline for percentiles
+
+
+# =================================================
+# PER-CALL STAGE TIMER
+# =================================================
+class StageTimer:
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.stages = OrderedDict()
+        self.rows = 0
+
+    @contextmanager
+    def stage(self, name):
+        # Re-entering a stage (e.g. once per chunk) accumulates its time
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+
+# =================================================
+# PROCESS-WIDE REGISTRY
+# =================================================
+class MetricsRegistry:
+
+    def __init__(self, maxlen=RECENT_CALLS):
+        self.maxlen = maxlen
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def record(self, timer, total):
+        entry = {
+            "time": time.time(),
+            "rows": timer.rows,
+            "total": total,
+            "stages": dict(timer.stages),
+        }
+        with self._lock:
+            self._calls.setdefault(timer.pipeline, deque(maxlen=self.maxlen)).append(entry)
+
+    def pipelines(self):
+        with self._lock:
+            return sorted(self._calls)
+
+    def recent(self, pipeline):
+        with self._lock:
+            return list(self._calls.get(pipeline, ()))
+
+    def summary(self, pipeline):
+        # One row per stage (plus "total") with percentiles in milliseconds
+        calls = self.recent(pipeline)
+        if not calls:
+            return []
+
+        names = []
+        for call in calls:
+            for name in call["stages"]:
+                if name not in names:
+                    names.append(name)
+        names.append("total")
+
+        mean_total = np.mean([c["total"] for c in calls]) or 1.0
+        rows = []
+
+        for name in names:
+            if name == "total":
+                values = np.array([c["total"] for c in calls])
+            else:
+                values = np.array([c["stages"][name] for c in calls if name in c["stages"]])
+
+            rows.append({
+                "stage": name,
+                "calls": int(len(values)),
+                "p50_ms": round(float(np.percentile(values, 50)) * 1000, 2),
+                "p90_ms": round(float(np.percentile(values, 90)) * 1000, 2),
+                "p99_ms": round(float(np.percentile(values, 99)) * 1000, 2),
+                "share_%": round(float(np.mean(values)) / mean_total * 100, 1),
+            })
+
+        return rows
+
+    def throughput(self, pipeline):
+        calls = self.recent(pipeline)
+        rows = sum(c["rows"] for c in calls)
+        seconds = sum(c["total"] for c in calls)
+        return {
+            "calls": len(calls),
+            "rows": rows,
+            "rows_per_second": round(rows / seconds, 1) if seconds else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._calls.clear()
+
+
+metrics_registry = MetricsRegistry()
+
+
+@contextmanager
+def track(pipeline, registry=metrics_registry):
+    # with track("run_detection") as timer:
+    #     with timer.stage("parse"): ...
+    #     timer.rows = n
+    timer = StageTimer(pipeline)
+    start = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        registry.record(timer, time.perf_counter() - start)
@@ -0,0 +1,126 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+# =================================================
+# SETTINGS
+# =================================================
+# Below this many rows the pool's IPC overhead outweighs the speed-up
+PARALLEL_MIN_ROWS = 100_000
+SHARD_ROWS = 25_000
+
+
+# =================================================
+# WORKER SIDE
+# =================================================
+# Each worker process loads the model once in the initializer; shards only
+# attach to the shared input/output blocks, so feature matrices and
+# probabilities are never pickled.
+def _init_worker():
+    from common.detection_utlis import load_model
+    load_model()
+
+
+def _score_shard(in_name, out_name, n_rows, n_features, n_classes, start, stop):
+    from common.detection_utlis import load_model
+
+    model = load_model()
+
+    shm_in = SharedMemory(name=in_name)
+    shm_out = SharedMemory(name=out_name)
+
+    try:
+        X = np.ndarray((n_rows, n_features), dtype=np.float32, buffer=shm_in.buf)
+        out = np.ndarray((n_rows, n_classes), dtype=np.float32, buffer=shm_out.buf)
+
+        out[start:stop] = model.predict(X[start:stop, np.newaxis, :], verbose=0)
+
+        del X, out
+    finally:
+        shm_in.close()
+        shm_out.close()
+
+    return start, stop
+
+
+# =================================================
+# POOL (ONE PER PROCESS, REUSED ACROSS JOBS)
+# =================================================
+_pool_lock = threading.Lock()
+_pool = {"executor": None, "workers": 0}
+
+
+def default_workers():
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def get_pool(workers=None):
+    workers = workers or default_workers()
+
+    with _pool_lock:
+        if _pool["executor"] is None or _pool["workers"] != workers:
+            if _pool["executor"] is not None:
+                _pool["executor"].shutdown(wait=True)
+
+            # spawn: forking a process that already initialised TensorFlow is unsafe
+            _pool["executor"] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+            _pool["workers"] = workers
+
+        return _pool["executor"]
+
+
+def shutdown_pool():
+    with _pool_lock:
+        if _pool["executor"] is not None:
+            _pool["executor"].shutdown(wait=True)
+        _pool["executor"] = None
+        _pool["workers"] = 0
+
+
+# =================================================
+# SHARDED PREDICTION
+# =================================================
+def predict_sharded(X, n_classes, workers=None, shard_rows=SHARD_ROWS):
+    X = np.asarray(X)
+    if X.ndim == 3:
+        X = X[:, 0, :]
+
+    n_rows, n_features = X.shape
+    pool = get_pool(workers)
+
+    shm_in = SharedMemory(create=True, size=max(1, n_rows * n_features * 4))
+    shm_out = SharedMemory(create=True, size=max(1, n_rows * n_classes * 4))
+
+    try:
+        shared_X = np.ndarray((n_rows, n_features), dtype=np.float32, buffer=shm_in.buf)
+        shared_X[:] = X
+
+        futures = [
+            pool.submit(_score_shard, shm_in.name, shm_out.name,
+                        n_rows, n_features, n_classes, start, min(start + shard_rows, n_rows))
+            for start in range(0, n_rows, shard_rows)
+        ]
+
+        # Shards write to their own row range, so order is preserved
+        for future in futures:
+            future.result()
+
+        preds = np.ndarray((n_rows, n_classes), dtype=np.float32, buffer=shm_out.buf).copy()
+
+        del shared_X
+    finally:
+        shm_in.close()
+        shm_in.unlink()
+        shm_out.close()
+        shm_out.unlink()
+
+    return preds
@@ -0,0 +1,16 @@
+# =================================================
+# SEVERITY LOGIC
+# =================================================
+# Kept free of the ML stack so pages that only need labels/severities
+# do not import TensorFlow, scikit-learn or the saved artefacts.
+def detect_severity(attack):
+    attack = str(attack).lower()
+
+    if attack == "normal":
+        return "Low"
+    elif attack in ["probe"]:
+        return "Medium"
+    elif attack in ["dos", "r2l", "u2r"]:
+        return "High"
+    else:
+        return "Medium"
@@ -0,0 +1,172 @@
+# bundle.py
+# Single-file, versioned model bundle: BiLSTM weights, scaler mean/scale,
+# label classes and training columns, with a SHA-256 checksum.
+#
+# Layout:
+#   MAGIC (8 bytes) | header length (uint64, little endian) | JSON header
+#   | padding | raw arrays, each aligned to ALIGN bytes
+#
+# The arrays are read through one read-only np.memmap, so every process
+# that opens the same bundle shares the same physical pages.
+#
+# Build from the loose artefacts (run from the intrusense/ directory):
+#     python -m ml.bundle [--out ../ids_model.bundle]
+import argparse
+import hashlib
+import json
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"IDSBNDL\x00"
+BUNDLE_VERSION = 1
+ALIGN = 64
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _aligned(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+# =================================================
+# LIGHTWEIGHT SCALER / ENCODER
+# =================================================
+# Expose the attributes and methods the detection code uses on the sklearn
+# objects, so a bundle needs neither pickle nor sklearn to load.
+class BundleScaler:
+    def __init__(self, mean, scale, with_mean=True, with_std=True):
+        self.mean_ = mean
+        self.scale_ = scale
+        self.with_mean = with_mean
+        self.with_std = with_std
+
+    def transform(self, X):
+        X = np.array(X, dtype=self.mean_.dtype)
+        if self.with_mean:
+            X -= self.mean_
+        if self.with_std:
+            X /= self.scale_
+        return X
+
+
+class BundleLabelEncoder:
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes, dtype=object)
+
+    def transform(self, y):
+        y = np.asarray(y, dtype=object)
+        lookup = {label: idx for idx, label in enumerate(self.classes_)}
+        unknown = sorted({str(v) for v in y if v not in lookup})
+        if unknown:
+            raise ValueError(f"y contains previously unseen labels: {unknown}")
+        return np.array([lookup[v] for v in y], dtype=np.int64)
+
+    def inverse_transform(self, y):
+        return self.classes_[np.asarray(y, dtype=np.intp)]
+
+
+# =================================================
+# WRITE
+# =================================================
+def write_bundle(path, weights, scaler, label_encoder, training_columns):
+    arrays = {f"model/{key}": np.ascontiguousarray(arr, dtype=np.float32) for key, arr in weights.items()}
+    arrays["scaler/mean"] = np.ascontiguousarray(scaler.mean_, dtype=np.float32)
+    arrays["scaler/scale"] = np.ascontiguousarray(scaler.scale_, dtype=np.float32)
+
+    entries = {}
+    offset = 0
+    for name, arr in arrays.items():
+        offset = _aligned(offset)
+        entries[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+        offset += arr.nbytes
+
+    data = bytearray(_aligned(offset))
+    for name, arr in arrays.items():
+        start = entries[name]["offset"]
+        data[start:start + arr.nbytes] = arr.tobytes()
+
+    header = json.dumps({
+        "version": BUNDLE_VERSION,
+        "arrays": entries,
+        "label_classes": [str(c) for c in label_encoder.classes_],
+        "training_columns": [str(c) for c in training_columns],
+        "scaler": {"with_mean": bool(scaler.with_mean), "with_std": bool(scaler.with_std)},
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }).encode("utf-8")
+
+    prefix = MAGIC + struct.pack("<Q", len(header)) + header
+    prefix += b"\x00" * (_aligned(len(prefix)) - len(prefix))
+
+    # Write next to the target and rename, so readers never see half a file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(prefix)
+        f.write(data)
+    os.replace(tmp_path, path)
+
+    return path
+
+
+# =================================================
+# READ
+# =================================================
+def read_bundle(path, verify=True):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a model bundle")
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+
+    if header["version"] != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported bundle version {header['version']} in {path}")
+
+    data_start = _aligned(len(MAGIC) + 8 + header_len)
+    data = np.memmap(path, dtype=np.uint8, mode="r", offset=data_start)
+
+    if verify and hashlib.sha256(data).hexdigest() != header["sha256"]:
+        raise ValueError(f"Checksum mismatch in {path}")
+
+    arrays = {}
+    for name, entry in header["arrays"].items():
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        start = entry["offset"]
+        arrays[name] = data[start:start + count * dtype.itemsize].view(dtype).reshape(entry["shape"])
+
+    return {
+        "header": header,
+        "weights": {name[len("model/"):]: arr for name, arr in arrays.items() if name.startswith("model/")},
+        "scaler": BundleScaler(arrays["scaler/mean"], arrays["scaler/scale"], **header["scaler"]),
+        "label_encoder": BundleLabelEncoder(header["label_classes"]),
+        "training_columns": header["training_columns"],
+    }
+
+
+def build_from_artifacts(out_path, weights_path, scaler_path, encoder_path, columns_path):
+    import joblib
+    from ml.numpy_model import read_keras_weights
+
+    return write_bundle(
+        out_path,
+        read_keras_weights(weights_path),
+        joblib.load(scaler_path),
+        joblib.load(encoder_path),
+        joblib.load(columns_path),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--weights", default=os.path.join(PROJECT_ROOT, "bilstm_ids.weights.h5"))
+    parser.add_argument("--scaler", default=os.path.join(PROJECT_ROOT, "scaler.pkl"))
+    parser.add_argument("--encoder", default=os.path.join(PROJECT_ROOT, "label_encoder.pkl"))
+    parser.add_argument("--columns", default=os.path.join(PROJECT_ROOT, "training_columns.pkl"))
+    parser.add_argument("--out", default=os.path.join(PROJECT_ROOT, "ids_model.bundle"))
+    args = parser.parse_args()
+
+    build_from_artifacts(args.out, args.weights, args.scaler, args.encoder, args.columns)
+
+    bundle = read_bundle(args.out)
+    print(f"Wrote {args.out} ({os.path.getsize(args.out):,} bytes, sha256 {bundle['header']['sha256'][:12]})")
@@ -0,0 +1,49 @@
+# cascade.py
+# Two-tier detector: a cheap first-stage classifier scores every row and
+# only rows it is unsure about are sent to the BiLSTM.
+import numpy as np
+
+CASCADE_THRESHOLD = 0.95   # stage-1 confidence needed to skip the BiLSTM
+
+
+def train_stage1(X, y, kind="logreg"):
+    # Fitted on the same scaled matrix / encoded labels as the BiLSTM
+    if kind == "logreg":
+        from sklearn.linear_model import LogisticRegression
+        model = LogisticRegression(max_iter=500)
+    elif kind == "tree":
+        from sklearn.tree import DecisionTreeClassifier
+        model = DecisionTreeClassifier(max_depth=12, min_samples_leaf=5)
+    else:
+        raise ValueError(f"Unknown stage-1 model: {kind}")
+
+    model.fit(X, y)
+    return model
+
+
+def stage1_proba(stage1, X, num_classes):
+    # Spread predict_proba columns onto the full label-encoder layout, in
+    # case a class was missing when stage 1 was fitted
+    X = X.reshape(len(X), -1)
+    proba = stage1.predict_proba(X)
+
+    full = np.zeros((len(X), num_classes), dtype=np.float32)
+    full[:, stage1.classes_.astype(int)] = proba
+    return full
+
+
+def cascade_predict(stage1, X, full_predict, num_classes, threshold=CASCADE_THRESHOLD):
+    # full_predict(rows) -> BiLSTM probabilities for the routed rows
+    preds = stage1_proba(stage1, X, num_classes)
+
+    routed = np.flatnonzero(preds.max(axis=1) < threshold)
+    if len(routed):
+        preds[routed] = full_predict(X[routed])
+
+    stats = {
+        "cascade_rows": int(len(X)),
+        "cascade_routed": int(len(routed)),
+        "cascade_routing_rate": round(len(routed) / len(X), 4) if len(X) else 0.0,
+    }
+
+    return preds, stats
@@ -0,0 +1,90 @@
+# check_numpy_backend.py
+# Checks that ml/numpy_model.py reads a weights file the way Keras does:
+# the file is loaded once by Keras (load_weights) and once by
+# read_keras_weights, and both models score the same random inputs.
+#
+# A legacy Keras 2 file cannot be loaded by Keras 3 directly, so it is
+# first re-saved with save_weights, which also exercises the Keras 3 reader.
+#
+# Run from the intrusense/ directory:
+#     python -m ml.check_numpy_backend [--weights path/to/model.weights.h5] [--rows 2000]
+import argparse
+import os
+import sys
+import tempfile
+
+import h5py
+import numpy as np
+
+from common import detection_utlis
+from ml.model import build_bilstm
+from ml.numpy_model import NumpyBiLSTM, WEIGHT_KEYS, read_keras_weights
+
+TOLERANCE = 1e-4
+
+
+def _keras_model(n_features, num_classes):
+    model = build_bilstm((1, n_features), num_classes)
+    model.build((None, 1, n_features))
+    return model
+
+
+def _keras3_copy(weights_path, tmp_dir):
+    # Keras 3 files are used as-is, legacy ones re-saved through Keras
+    with h5py.File(weights_path, "r") as f:
+        legacy = "layer_names" in f.attrs
+    if not legacy:
+        return weights_path
+
+    weights = read_keras_weights(weights_path)
+    model = _keras_model(weights["fwd_kernel"].shape[0], weights["out_bias"].shape[0])
+    model.set_weights([weights[key] for key in WEIGHT_KEYS])
+
+    path = os.path.join(tmp_dir, "keras3.weights.h5")
+    model.save_weights(path)
+    return path
+
+
+def compare(weights_path, rows=2000, seed=0):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = _keras3_copy(weights_path, tmp_dir)
+
+        numpy_model = NumpyBiLSTM.from_weights_file(path)
+        n_features = numpy_model.weights["fwd_kernel"].shape[0]
+        num_classes = numpy_model.weights["out_bias"].shape[0]
+
+        keras_model = _keras_model(n_features, num_classes)
+        keras_model.load_weights(path)
+
+    X = np.random.default_rng(seed).standard_normal((rows, 1, n_features)).astype(np.float32)
+
+    expected = keras_model.predict(X, verbose=0)
+    actual = numpy_model.predict(X)
+
+    return {
+        "rows": rows,
+        "max_abs_diff": float(np.max(np.abs(expected - actual))),
+        "argmax_agreement": float(np.mean(expected.argmax(axis=1) == actual.argmax(axis=1))),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--weights", default=detection_utlis.MODEL_PATH)
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    result = compare(args.weights, args.rows)
+
+    print(f"Max |keras - numpy|: {result['max_abs_diff']:.2e}")
+    print(f"Argmax agreement:    {result['argmax_agreement']:.2%} of {result['rows']:,} rows")
+
+    if result["max_abs_diff"] > TOLERANCE:
+        print("MISMATCH: the NumPy backend does not reproduce Keras")
+        sys.exit(1)
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# dataset_cache.py
+# On-disk cache of preprocessed training datasets.
+#
+# Entries are keyed by the SHA-256 of the source file's contents plus the
+# preprocessing config, so a renamed or touched file still hits and an
+# edited one misses. Each entry holds X/y as .npy (loaded memory-mapped)
+# and the fitted scaler, label encoder and training columns. Least recently
+# used entries are evicted once the cache grows past its size limit.
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import joblib
+import numpy as np
+
+try:
+    from ml.feature_plan import CATEGORICAL_FIELDS, FEATURE_DTYPE
+    from ml.preprocessing import load_and_preprocess
+except ImportError:  # run from inside ml/ (train.py, admin "Run Preprocessing")
+    from feature_plan import CATEGORICAL_FIELDS, FEATURE_DTYPE
+    from preprocessing import load_and_preprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DATASET_CACHE_DIR = os.environ.get("IDS_DATASET_CACHE_DIR", os.path.join(PROJECT_ROOT, "dataset_cache"))
+DATASET_CACHE_MAX_BYTES = int(float(os.environ.get("IDS_DATASET_CACHE_MAX_MB", "2048")) * 1024 * 1024)
+
+# Bump whenever load_and_preprocess changes its output for the same input
+PREPROCESS_VERSION = 2
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def preprocess_config(has_header=True):
+    return {
+        "version": PREPROCESS_VERSION,
+        "training": True,
+        "has_header": has_header,
+        "dtype": np.dtype(FEATURE_DTYPE).name,
+        "categorical_fields": list(CATEGORICAL_FIELDS),
+    }
+
+
+def cache_key(path, config):
+    payload = json.dumps({"source": file_sha256(path), "config": config}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_size(entry_dir):
+    return sum(
+        os.path.getsize(os.path.join(entry_dir, name))
+        for name in os.listdir(entry_dir)
+    )
+
+
+def _entries(cache_dir):
+    # (last_used, size, path) for every complete entry
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry_dir = os.path.join(cache_dir, name)
+        meta_path = os.path.join(entry_dir, "meta.json")
+        if os.path.isfile(meta_path):
+            entries.append((os.path.getmtime(meta_path), _entry_size(entry_dir), entry_dir))
+    return entries
+
+
+def evict(cache_dir=DATASET_CACHE_DIR, max_bytes=DATASET_CACHE_MAX_BYTES, keep=None):
+    if not os.path.isdir(cache_dir):
+        return []
+
+    entries = sorted(_entries(cache_dir))
+    total = sum(size for _, size, _ in entries)
+    removed = []
+
+    for _, size, entry_dir in entries:
+        if total <= max_bytes:
+            break
+        if entry_dir == keep:
+            continue
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total -= size
+        removed.append(entry_dir)
+
+    return removed
+
+
+def _load_entry(entry_dir):
+    # Refresh the entry's LRU timestamp
+    os.utime(os.path.join(entry_dir, "meta.json"))
+
+    transformers = joblib.load(os.path.join(entry_dir, "transformers.pkl"))
+
+    return (
+        np.load(os.path.join(entry_dir, "X.npy"), mmap_mode="r"),
+        np.load(os.path.join(entry_dir, "y.npy"), mmap_mode="r"),
+        transformers["scaler"],
+        transformers["label_encoder"],
+        transformers["training_columns"],
+    )
+
+
+def cached_load_and_preprocess(path, has_header=True, cache_dir=DATASET_CACHE_DIR, max_bytes=DATASET_CACHE_MAX_BYTES):
+    # Drop-in for load_and_preprocess(path, training=True); returns the
+    # same tuple plus whether it came from the cache
+    config = preprocess_config(has_header)
+    key = cache_key(path, config)
+    entry_dir = os.path.join(cache_dir, key)
+
+    if os.path.isfile(os.path.join(entry_dir, "meta.json")):
+        return _load_entry(entry_dir) + (True,)
+
+    X, y, scaler, label_encoder, training_columns = load_and_preprocess(path, training=True, has_header=has_header)
+
+    # Written to a temporary directory and renamed, so a crash or a
+    # concurrent run never leaves a half-written entry behind
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    np.save(os.path.join(tmp_dir, "X.npy"), X)
+    np.save(os.path.join(tmp_dir, "y.npy"), y)
+    joblib.dump(
+        {"scaler": scaler, "label_encoder": label_encoder, "training_columns": training_columns},
+        os.path.join(tmp_dir, "transformers.pkl")
+    )
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump({"source": os.path.abspath(path), "config": config, "created": time.time(), "shape": list(X.shape)}, f, indent=4)
+
+    try:
+        os.replace(tmp_dir, entry_dir)
+    except OSError:
+        # Another process stored the same entry first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    evict(cache_dir, max_bytes, keep=entry_dir)
+
+    return X, y, scaler, label_encoder, training_columns, False
@@ -0,0 +1,103 @@
+# distill.py
+# Knowledge distillation: trains a small Dense "student" on the BiLSTM
+# teacher's soft outputs, for sub-millisecond live/stream scoring.
+#
+# Run from the intrusense/ directory on the NSL-KDD training set:
+#     python -m ml.distill path/to/KDDTrain+.csv [--hidden 32] [--epochs 5] [--temperature 2.0]
+#
+# Saves student_ids.weights.h5 (Keras) and student_ids.npz (NumPy runtime,
+# loaded by common/detection_utlis) next to the teacher's weights.
+import argparse
+import os
+
+import numpy as np
+
+from common import detection_utlis
+from ml.numpy_model import NumpyMLP
+from ml.preprocessing import load_and_preprocess
+
+
+def soften(probs, temperature):
+    # softmax(log(p) / T): the teacher's distribution at temperature T
+    logits = np.log(np.clip(probs, 1e-8, 1.0)) / temperature
+    logits -= logits.max(axis=1, keepdims=True)
+    e = np.exp(logits)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def build_student(n_features, num_classes, hidden):
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense, Input
+
+    # Outputs logits; the softmax is applied by NumpyMLP at inference time
+    return Sequential([
+        Input(shape=(n_features,)),
+        Dense(hidden, activation="relu"),
+        Dense(num_classes)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("csv")
+    parser.add_argument("--hidden", type=int, default=32)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--temperature", type=float, default=2.0)
+    args = parser.parse_args()
+
+    import tensorflow as tf
+
+    artifacts = detection_utlis.load_artifacts()
+
+    X, y, _, _, _ = load_and_preprocess(
+        args.csv,
+        training=False,
+        scaler=artifacts["scaler"],
+        label_encoder=artifacts["label_encoder"],
+        training_columns=artifacts["training_columns"]
+    )
+    X = X.astype(np.float32)
+
+    teacher = detection_utlis.load_model("teacher")
+    teacher_probs = teacher.predict(X[:, np.newaxis, :], verbose=0)
+    targets = soften(teacher_probs, args.temperature)
+
+    student = build_student(X.shape[1], artifacts["num_classes"], args.hidden)
+
+    T = args.temperature
+
+    def distillation_loss(y_true, logits):
+        # Cross-entropy against the softened teacher = KL up to a constant
+        return tf.keras.losses.categorical_crossentropy(y_true, logits / T, from_logits=True)
+
+    student.compile(optimizer="adam", loss=distillation_loss)
+    student.summary()
+
+    student.fit(
+        X, targets,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        validation_split=0.1,
+        verbose=2
+    )
+
+    weights_path = os.path.join(detection_utlis.PROJECT_ROOT, "student_ids.weights.h5")
+    student.save_weights(weights_path)
+
+    w = student.get_weights()
+    numpy_student = NumpyMLP(list(zip(w[0::2], w[1::2])))
+    numpy_student.save(detection_utlis.STUDENT_PATH)
+
+    student_preds = numpy_student.predict(X).argmax(axis=1)
+    teacher_preds = teacher_probs.argmax(axis=1)
+
+    print("\n=== Distillation Results ===")
+    print("Agreement with teacher:", float(np.mean(student_preds == teacher_preds)))
+    print("Teacher accuracy:", float(np.mean(teacher_preds == y)))
+    print("Student accuracy:", float(np.mean(student_preds == y)))
+    print(f"Saved {weights_path} and {detection_utlis.STUDENT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# evaluate.py
+# Streaming evaluation of the deployed model on labelled test sets of any
+# size: the file is read in chunks, each chunk is preprocessed in
+# "evaluate" mode and scored, and only a confusion matrix is kept between
+# chunks. The report uses the final_accuracy / confusion_matrix /
+# classification_report layout of training_results.json.
+#
+# Run from the intrusense/ directory on a labelled CSV or Parquet file:
+#     python -m ml.evaluate path/to/KDDTest+.csv [--chunksize 50000] [--out test_results.json]
+import argparse
+import json
+import time
+
+import numpy as np
+
+from common import detection_utlis
+from ml.ingest import read_typed
+from ml.preprocessing import load_and_preprocess
+
+EVAL_CHUNK_SIZE = 50_000
+
+
+def classification_report_from_confusion(cm, class_names):
+    # Same numbers and keys as sklearn's classification_report(output_dict=True),
+    # with 0.0 where a precision/recall denominator is zero
+    cm = np.asarray(cm, dtype=np.float64)
+    tp = np.diag(cm)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+    total = support.sum()
+    report = {}
+
+    for i, name in enumerate(class_names):
+        report[str(name)] = {
+            "precision": float(precision[i]),
+            "recall": float(recall[i]),
+            "f1-score": float(f1[i]),
+            "support": float(support[i]),
+        }
+
+    report["accuracy"] = float(tp.sum() / total) if total else 0.0
+
+    weights = support / total if total else np.zeros_like(support)
+    report["macro avg"] = {
+        "precision": float(precision.mean()),
+        "recall": float(recall.mean()),
+        "f1-score": float(f1.mean()),
+        "support": float(total),
+    }
+    report["weighted avg"] = {
+        "precision": float(precision @ weights),
+        "recall": float(recall @ weights),
+        "f1-score": float(f1 @ weights),
+        "support": float(total),
+    }
+
+    return report
+
+
+def evaluate_stream(source, chunksize=EVAL_CHUNK_SIZE, progress_callback=None):
+    # Scores with the deployed model itself: no cascade, no inference
+    # server or process pool, no prediction cache
+    model, artifacts = detection_utlis.load_snapshot()
+
+    class_names = list(artifacts["label_encoder"].classes_)
+    num_classes = len(class_names)
+    cm = np.zeros((num_classes, num_classes), dtype=np.int64)
+
+    rows = 0
+    chunks = 0
+    start = time.perf_counter()
+
+    for chunk in read_typed(source, artifacts["training_columns"], chunksize=chunksize):
+        X, y, _, _, _ = load_and_preprocess(
+            chunk,
+            mode="evaluate",
+            scaler=artifacts["scaler"],
+            label_encoder=artifacts["label_encoder"],
+            training_columns=artifacts["training_columns"]
+        )
+
+        X_unique, inverse = detection_utlis.unique_rows(X)
+        preds = model.predict(X_unique, verbose=0).argmax(axis=1)[inverse]
+
+        cm += np.bincount(y * num_classes + preds, minlength=num_classes * num_classes).reshape(num_classes, num_classes)
+
+        rows += len(y)
+        chunks += 1
+
+        if progress_callback is not None:
+            progress_callback(rows)
+
+    report = classification_report_from_confusion(cm, class_names)
+
+    return {
+        "final_accuracy": report["accuracy"],
+        "confusion_matrix": cm.tolist(),
+        "classification_report": report,
+        "rows": rows,
+        "chunks": chunks,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--chunksize", type=int, default=EVAL_CHUNK_SIZE)
+    parser.add_argument("--out", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    results = evaluate_stream(
+        args.path,
+        args.chunksize,
+        progress_callback=lambda rows: print(f"  {rows:,} rows evaluated", flush=True)
+    )
+
+    print("\nEVALUATION REPORT")
+    print("-" * 60)
+    print(f"Accuracy: {results['final_accuracy']:.5f} on {results['rows']:,} rows ({results['seconds']}s)")
+    print(f"{'Class':<10}{'Precision':>12}{'Recall':>12}{'F1':>12}{'Support':>12}")
+    for name, metrics in results["classification_report"].items():
+        if isinstance(metrics, dict):
+            print(
+                f"{name:<14}{metrics['precision']:>8.4f}{metrics['recall']:>12.4f}"
+                f"{metrics['f1-score']:>12.4f}{int(metrics['support']):>12}"
+            )
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
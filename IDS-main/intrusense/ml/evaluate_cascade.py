@@ -0,0 +1,93 @@
+# evaluate_cascade.py
+# Routing rate and accuracy impact of the two-tier cascade against the
+# full BiLSTM on a labelled CSV.
+#
+# Run from the intrusense/ directory:
+#     python -m ml.evaluate_cascade path/to/labelled.csv [--thresholds 0.9 0.95 0.99]
+# Pass --fit-on path/to/train.csv to fit a stage-1 model on the spot
+# instead of loading cascade_stage1.pkl.
+import argparse
+import json
+import os
+
+import joblib
+import numpy as np
+from sklearn.metrics import accuracy_score
+
+from common import detection_utlis
+from ml.cascade import cascade_predict, train_stage1
+from ml.preprocessing import load_and_preprocess
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("csv")
+    parser.add_argument("--stage1", default=detection_utlis.CASCADE_PATH)
+    parser.add_argument("--fit-on", help="Labelled CSV to fit a fresh stage-1 model on")
+    parser.add_argument("--kind", default="logreg", choices=["logreg", "tree"])
+    parser.add_argument("--thresholds", nargs="+", type=float, default=[0.8, 0.9, 0.95, 0.99])
+    parser.add_argument("--out", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    artifacts = detection_utlis.load_artifacts()
+
+    def prepare(path):
+        X, y, _, _, _ = load_and_preprocess(
+            path,
+            training=False,
+            scaler=artifacts["scaler"],
+            label_encoder=artifacts["label_encoder"],
+            training_columns=artifacts["training_columns"]
+        )
+        return X, y
+
+    if args.fit_on:
+        stage1 = train_stage1(*prepare(args.fit_on), kind=args.kind)
+    elif os.path.exists(args.stage1):
+        stage1 = joblib.load(args.stage1)
+    else:
+        parser.error(f"{args.stage1} not found; run ml/train.py or pass --fit-on")
+
+    X, y = prepare(args.csv)
+    model = detection_utlis.load_model()
+
+    def full_predict(rows):
+        return model.predict(np.expand_dims(rows, axis=1), verbose=0)
+
+    full_preds = full_predict(X).argmax(axis=1)
+    full_accuracy = float(accuracy_score(y, full_preds))
+
+    report = {"rows": int(len(y)), "full_model_accuracy": full_accuracy, "thresholds": []}
+
+    for threshold in args.thresholds:
+        preds, stats = cascade_predict(stage1, X, full_predict, artifacts["num_classes"], threshold)
+        preds = preds.argmax(axis=1)
+        accuracy = float(accuracy_score(y, preds))
+
+        report["thresholds"].append({
+            "threshold": threshold,
+            "routing_rate": stats["cascade_routing_rate"],
+            "model_calls_saved": round(1 - stats["cascade_routing_rate"], 4),
+            "accuracy": accuracy,
+            "accuracy_delta": accuracy - full_accuracy,
+            "agreement_with_full": float(np.mean(preds == full_preds)),
+        })
+
+    print("\nCASCADE REPORT")
+    print("-" * 60)
+    print(f"Full BiLSTM accuracy: {full_accuracy:.5f} on {len(y)} rows")
+    print(f"{'Threshold':>10}{'Routed':>10}{'Accuracy':>12}{'Delta':>12}{'Agreement':>12}")
+    for r in report["thresholds"]:
+        print(
+            f"{r['threshold']:>10.2f}{r['routing_rate'] * 100:>9.1f}%{r['accuracy']:>12.5f}"
+            f"{r['accuracy_delta']:>+12.5f}{r['agreement_with_full']:>12.5f}"
+        )
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# evaluate_quantized.py
+# Accuracy/confusion-matrix delta of the quantized NumPy backend against
+# the float model and against the baseline recorded in training_results.json.
+#
+# Run from the intrusense/ directory on a labelled CSV (use KDDTrain+ for a
+# like-for-like comparison with training_results.json):
+#     python -m ml.evaluate_quantized path/to/labelled.csv [--modes float16 int8]
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from sklearn.metrics import accuracy_score, confusion_matrix
+
+from common import detection_utlis
+from ml.numpy_model import NumpyBiLSTM, QUANTIZATION_MODES, read_keras_weights, weights_nbytes
+from ml.preprocessing import load_and_preprocess
+
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "training_results.json")
+
+
+def score(model, X, y, labels):
+    start = time.perf_counter()
+    preds = model.predict(X).argmax(axis=1)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "accuracy": float(accuracy_score(y, preds)),
+        "confusion_matrix": confusion_matrix(y, preds, labels=labels).tolist(),
+        "predict_seconds": round(elapsed, 4),
+        "weight_bytes": weights_nbytes(model.weights),
+    }, preds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("csv")
+    parser.add_argument("--weights", default=detection_utlis.MODEL_PATH)
+    parser.add_argument("--modes", nargs="+", default=list(QUANTIZATION_MODES), choices=QUANTIZATION_MODES)
+    parser.add_argument("--out", help="Optional path for the JSON report")
+    args = parser.parse_args()
+
+    artifacts = detection_utlis.load_artifacts()
+
+    X, y, _, _, _ = load_and_preprocess(
+        args.csv,
+        training=False,
+        scaler=artifacts["scaler"],
+        label_encoder=artifacts["label_encoder"],
+        training_columns=artifacts["training_columns"]
+    )
+
+    labels = list(range(artifacts["num_classes"]))
+    weights = read_keras_weights(args.weights)
+
+    float_result, float_preds = score(NumpyBiLSTM(weights), X, y, labels)
+
+    report = {
+        "rows": int(len(y)),
+        "classes": list(artifacts["label_encoder"].classes_),
+        "float32": float_result,
+    }
+
+    if os.path.exists(RESULTS_FILE):
+        with open(RESULTS_FILE) as f:
+            recorded = json.load(f)
+        report["recorded_baseline"] = {
+            "accuracy": recorded.get("final_accuracy"),
+            "confusion_matrix": recorded.get("confusion_matrix"),
+        }
+
+    for mode in args.modes:
+        result, preds = score(NumpyBiLSTM(weights, quantization=mode), X, y, labels)
+
+        result["accuracy_delta_vs_float32"] = result["accuracy"] - float_result["accuracy"]
+        result["agreement_with_float32"] = float(np.mean(preds == float_preds))
+        result["confusion_delta_vs_float32"] = (
+            np.array(result["confusion_matrix"]) - np.array(float_result["confusion_matrix"])
+        ).tolist()
+
+        baseline = report.get("recorded_baseline", {})
+        if baseline.get("accuracy") is not None:
+            result["accuracy_delta_vs_recorded"] = result["accuracy"] - baseline["accuracy"]
+        if baseline.get("confusion_matrix") is not None and len(baseline["confusion_matrix"]) == len(labels):
+            result["confusion_delta_vs_recorded"] = (
+                np.array(result["confusion_matrix"]) - np.array(baseline["confusion_matrix"])
+            ).tolist()
+
+        report[mode] = result
+
+    print("\nQUANTIZATION REPORT")
+    print("-" * 60)
+    print(f"{'Mode':<10}{'Accuracy':>12}{'Delta':>12}{'Agreement':>12}{'Weights (KB)':>14}")
+    for mode in ["float32"] + args.modes:
+        r = report[mode]
+        print(
+            f"{mode:<10}{r['accuracy']:>12.5f}{r.get('accuracy_delta_vs_float32', 0.0):>+12.5f}"
+            f"{r.get('agreement_with_float32', 1.0):>12.5f}{r['weight_bytes'] / 1024:>14.1f}"
+        )
+    if "recorded_baseline" in report:
+        print(f"Recorded baseline accuracy (training_results.json): {report['recorded_baseline']['accuracy']:.5f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# feature_plan.py
+# Precompiled replacement for pd.get_dummies + reindex(training_columns).
+#
+# The plan is built once from training_columns: the position of every
+# numeric column and, for each symbolic field, a category -> column index
+# map. Applying it fills a preallocated matrix directly (numeric copies
+# plus one scatter write per symbolic field) and yields exactly what
+# get_dummies + reindex(fill_value=0) produced.
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_FIELDS = ("protocol_type", "service", "flag")
+
+# Template name -> name used by the NSL-KDD training header. Input frames
+# keep their own header; apply_plan reads the alias when the training name
+# is absent.
+COLUMN_ALIASES = {"num_failed_logins": "_o"}
+_INPUT_NAMES = {name: alias for alias, name in COLUMN_ALIASES.items()}
+
+# Feature matrices are float32 from the plan through scaling to the model
+# input, which is what the model computes in anyway. IDS_FEATURE_DTYPE=float64
+# restores the old precision (e.g. for benchmarks/detection_memory.py).
+FEATURE_DTYPE = np.dtype(os.environ.get("IDS_FEATURE_DTYPE", "float32"))
+
+
+@lru_cache(maxsize=8)
+def _cached_plan(columns, categorical_fields):
+    categories = {field: {} for field in categorical_fields}
+    numeric_names = []
+    numeric_index = []
+
+    for idx, col in enumerate(columns):
+        for field in categorical_fields:
+            if col.startswith(field + "_"):
+                categories[field][col[len(field) + 1:]] = idx
+                break
+        else:
+            numeric_names.append(col)
+            numeric_index.append(idx)
+
+    return {
+        "columns": list(columns),
+        "numeric_names": numeric_names,
+        "numeric_index": np.array(numeric_index, dtype=np.intp),
+        "categories": {
+            field: {
+                "values": pd.Index(list(mapping)),
+                "index": np.array(list(mapping.values()), dtype=np.intp),
+            }
+            for field, mapping in categories.items()
+        },
+    }
+
+
+def build_feature_plan(training_columns, categorical_fields=CATEGORICAL_FIELDS):
+    return _cached_plan(tuple(training_columns), tuple(categorical_fields))
+
+
+def apply_plan(plan, df, dtype=FEATURE_DTYPE):
+    n_rows = len(df)
+    X = np.zeros((n_rows, len(plan["columns"])), dtype=dtype)
+
+    # Numeric columns the input lacks stay 0, like reindex(fill_value=0)
+    for name, idx in zip(plan["numeric_names"], plan["numeric_index"]):
+        if name not in df.columns:
+            name = _INPUT_NAMES.get(name)
+        if name in df.columns:
+            X[:, idx] = df[name].to_numpy(dtype=dtype, na_value=np.nan)
+
+    rows = np.arange(n_rows)
+
+    for field, spec in plan["categories"].items():
+        # Raises KeyError on a missing field, as get_dummies did
+        values = df[field]
+
+        # Codes against the training vocabulary, matched on str(value) like
+        # the get_dummies column names; unseen values and NaN give -1
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Typed ingestion (ml/ingest.py): look up each category once
+            lookup = spec["values"].get_indexer(values.cat.categories.astype(str))
+            cat_codes = values.cat.codes.to_numpy()
+            codes = np.where(cat_codes >= 0, lookup[cat_codes], -1)
+        else:
+            codes = spec["values"].get_indexer(values.astype(str).where(values.notna(), None))
+        hit = codes >= 0
+        X[rows[hit], spec["index"][codes[hit]]] = 1
+
+    return X
+
+
+def scale_inplace(X, scaler):
+    # Same arithmetic as StandardScaler.transform, without the DataFrame /
+    # feature-name round trip and without a second output matrix
+    if scaler.with_mean:
+        X -= scaler.mean_.astype(X.dtype, copy=False)
+    if scaler.with_std:
+        X /= scaler.scale_.astype(X.dtype, copy=False)
+    return X
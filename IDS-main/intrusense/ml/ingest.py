@@ -0,0 +1,286 @@
+# ingest.py
+# Typed, column-pruned CSV/Parquet parsing for detection uploads and
+# training files, and Parquet output for annotated results.
+#
+# The schema comes from common/feature_template.base_feature_vector (plus any
+# numeric training column it lacks): float64 for numeric fields, category
+# for the three symbolic fields. By default only schema columns (and
+# label/difficulty when present) are parsed; a file missing a feature
+# column, or with a non-numeric value in a numeric one, fails before any
+# detection work.
+#
+# keep_columns=True is for frames that become the annotated output: every
+# column is parsed under the file's own header, and only the symbolic
+# fields are forced to category. Numeric feature columns keep the parser's
+# inferred dtype (integers stay integers) and are checked to be numeric
+# after parsing; other columns (IDs, addresses, timestamps...) are parsed
+# untyped. Column aliases such as num_failed_logins -> _o are resolved by
+# the feature plan, never by renaming the user's columns.
+#
+# Chunked CSV reads type every chunk on its own, so a column that is empty
+# in one chunk and text in the next would change dtype. There the
+# pass-through columns are read as str, and stable_dtypes=True (used for
+# Parquet output, whose schema is fixed by the first chunk) also reads the
+# numeric feature columns as float64.
+#
+# Parquet (detected by its PAR1 magic) needs the optional pyarrow package.
+# Null-free numeric columns reach pandas as zero-copy views of the Arrow
+# buffers, and the symbolic fields are read dictionary-encoded, i.e. as
+# pandas categoricals without a per-row string pass.
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    from common.feature_template import base_feature_vector
+except ImportError:  # run from inside ml/: make intrusense/ importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from common.feature_template import base_feature_vector
+
+try:
+    from ml.feature_plan import CATEGORICAL_FIELDS, COLUMN_ALIASES, build_feature_plan
+except ImportError:  # run from inside ml/ (train.py, admin "Run Preprocessing")
+    from feature_plan import CATEGORICAL_FIELDS, COLUMN_ALIASES, build_feature_plan
+
+# Parsed when present, not required
+OPTIONAL_COLUMNS = ("label", "difficulty")
+
+# "pyarrow" parses with several threads, "c" is pandas' own parser, "auto"
+# uses pyarrow when it is installed. Chunked reads always use "c".
+CSV_ENGINE = os.environ.get("IDS_CSV_ENGINE", "auto").lower()
+
+PARQUET_MAGIC = b"PAR1"
+PARQUET_ROW_GROUP_ROWS = 100_000
+
+
+def csv_schema(training_columns=None):
+    names = [COLUMN_ALIASES.get(name, name) for name in base_feature_vector()]
+
+    if training_columns is not None:
+        names += [name for name in build_feature_plan(training_columns)["numeric_names"] if name not in names]
+
+    return {
+        name: "category" if name in CATEGORICAL_FIELDS else np.float64
+        for name in names
+    }
+
+
+def _csv_engine():
+    if CSV_ENGINE != "auto":
+        return CSV_ENGINE
+    try:
+        import pyarrow  # noqa: F401
+        return "pyarrow"
+    except ImportError:
+        return "c"
+
+
+def _read_header(source):
+    header = list(pd.read_csv(source, header=0, nrows=0).columns)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return header
+
+
+def resolve_columns(header, schema, keep_columns=False):
+    # header column -> schema name; an alias only stands in for its schema
+    # name when the file does not also carry the schema name itself
+    features = {}
+    for col in header:
+        if col in schema:
+            features[col] = col
+        elif COLUMN_ALIASES.get(col) in schema and COLUMN_ALIASES[col] not in header:
+            features[col] = COLUMN_ALIASES[col]
+
+    missing = [name for name in schema if name not in features.values()]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+    if keep_columns:
+        usecols = list(header)
+        dtype = {col: "category" for col, name in features.items() if schema[name] == "category"}
+    else:
+        usecols = [col for col in header if col in features or col in OPTIONAL_COLUMNS]
+        dtype = {col: schema[name] for col, name in features.items()}
+
+    # Feature columns left to the parser's inference, checked afterwards
+    numeric = [col for col, name in features.items() if col not in dtype]
+
+    return usecols, dtype, numeric
+
+
+def _check_numeric(df, numeric):
+    for col in numeric:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            raise _schema_error(f"column '{col}' is not numeric")
+    return df
+
+
+def read_typed_csv(source, training_columns=None, chunksize=None, engine=None, keep_columns=False, stable_dtypes=False):
+    # source: path, bytes or file-like object. With chunksize, returns an
+    # iterator of typed chunks like pd.read_csv does.
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    elif hasattr(source, "seek"):
+        source.seek(0)
+
+    usecols, dtype, numeric = resolve_columns(_read_header(source), csv_schema(training_columns), keep_columns)
+
+    if keep_columns and chunksize:
+        dtype.update({col: "str" for col in usecols if col not in dtype and col not in numeric})
+        if stable_dtypes:
+            dtype.update({col: np.float64 for col in numeric})
+            numeric = []
+
+    engine = "c" if chunksize else (engine or _csv_engine())
+
+    try:
+        reader = pd.read_csv(source, header=0, usecols=usecols, dtype=dtype, engine=engine, chunksize=chunksize)
+    except ValueError as e:
+        raise _schema_error(e) from e
+
+    if chunksize:
+        return _typed_chunks(reader, numeric)
+
+    return _check_numeric(reader, numeric)
+
+
+def _schema_error(e):
+    return ValueError(f"CSV does not match the detection schema: {e}")
+
+
+def _typed_chunks(reader, numeric):
+    # Chunks are parsed lazily, so type errors surface while iterating
+    with reader:
+        while True:
+            try:
+                chunk = next(reader, None)
+            except ValueError as e:
+                raise _schema_error(e) from e
+            if chunk is None:
+                return
+            yield _check_numeric(chunk, numeric)
+
+
+# =================================================
+# PARQUET / ARROW
+# =================================================
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ValueError("Parquet support needs pyarrow: pip install pyarrow") from e
+    return pa, pq
+
+
+def is_parquet(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            head = f.read(len(PARQUET_MAGIC))
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        head = bytes(source[:len(PARQUET_MAGIC)])
+    else:
+        source.seek(0)
+        head = source.read(len(PARQUET_MAGIC))
+        source.seek(0)
+    return head == PARQUET_MAGIC
+
+
+def _parquet_file(source):
+    pa, pq = _pyarrow()
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        # Wraps the upload's buffer instead of copying it
+        source = pa.BufferReader(source)
+    elif hasattr(source, "seek"):
+        source.seek(0)
+
+    return pq.ParquetFile(source, read_dictionary=list(CATEGORICAL_FIELDS))
+
+
+def _parquet_columns(pf, training_columns, keep_columns=False):
+    pa, _ = _pyarrow()
+    arrow_schema = pf.schema_arrow
+
+    usecols, dtype, numeric = resolve_columns(arrow_schema.names, csv_schema(training_columns), keep_columns)
+
+    for col in numeric + [col for col, kind in dtype.items() if kind != "category"]:
+        field_type = arrow_schema.field(col).type
+        if not (pa.types.is_integer(field_type) or pa.types.is_floating(field_type) or pa.types.is_boolean(field_type)):
+            raise ValueError(f"Parquet does not match the detection schema: column '{col}' has type {field_type}")
+
+    return usecols
+
+
+def _arrow_to_frame(table):
+    # split_blocks keeps one block per column, so pandas does not
+    # consolidate (copy) the numeric columns into a 2D block
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def read_typed_parquet(source, training_columns=None, chunksize=None, keep_columns=False):
+    pa, _ = _pyarrow()
+    pf = _parquet_file(source)
+    usecols = _parquet_columns(pf, training_columns, keep_columns)
+
+    if chunksize:
+        return (
+            _arrow_to_frame(pa.Table.from_batches([batch]))
+            for batch in pf.iter_batches(batch_size=chunksize, columns=usecols)
+        )
+
+    return _arrow_to_frame(pf.read(columns=usecols))
+
+
+def parquet_num_rows(source):
+    return _parquet_file(source).metadata.num_rows
+
+
+def read_typed(source, training_columns=None, chunksize=None, keep_columns=False, stable_dtypes=False):
+    # Parquet or CSV, decided by the file's magic bytes. Parquet columns
+    # already have one type per file, so stable_dtypes only affects CSV.
+    if is_parquet(source):
+        return read_typed_parquet(source, training_columns, chunksize, keep_columns)
+    return read_typed_csv(source, training_columns, chunksize, keep_columns=keep_columns, stable_dtypes=stable_dtypes)
+
+
+class ParquetSink:
+    """Appends DataFrames to one Parquet file, in row groups of row_group_size."""
+
+    def __init__(self, target, row_group_size=PARQUET_ROW_GROUP_ROWS):
+        self.target = target
+        self.row_group_size = row_group_size
+        self.writer = None
+
+    def write(self, df):
+        pa, pq = _pyarrow()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.target, table.schema)
+        else:
+            # e.g. category index widths can differ between chunks
+            table = table.cast(self.writer.schema)
+
+        self.writer.write_table(table, row_group_size=self.row_group_size)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_parquet(df, target, row_group_size=PARQUET_ROW_GROUP_ROWS):
+    # target: path or binary file-like (e.g. io.BytesIO for a download)
+    with ParquetSink(target, row_group_size) as sink:
+        sink.write(df)
+    return target
@@ -1,4 +1,5 @@
 # model.py
+import numpy as np
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Dense, Dropout, Bidirectional, LSTM, Input
@@ -23,6 +24,49 @@ def build_bilstm(input_shape, num_classes):
     return model
 
 
+# =================================================
+# RETRACING-FREE INFERENCE
+# =================================================
+# Keras predict() sets up a new execution per call and can retrace for
+# every new batch size. CompiledPredictor wraps the model in one
+# tf.function whose [None, 1, n_features] signature is traced once and
+# then runs any batch size as-is, without padding. Batches larger than
+# PREDICT_BATCH_SIZE run in slices to bound the activations' memory.
+PREDICT_BATCH_SIZE = 4096
+
+
+class CompiledPredictor:
+
+    def __init__(self, model, n_features, max_batch_size=PREDICT_BATCH_SIZE):
+        self.model = model
+        self.n_features = n_features
+        self.max_batch_size = max_batch_size
+
+        self._infer = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec([None, 1, n_features], tf.float32)]
+        )
+
+    def warm_up(self):
+        # One trace serves every batch size
+        self._infer(tf.zeros((1, 1, self.n_features), tf.float32))
+
+    def predict(self, X, verbose=0, batch_size=None):
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 2:
+            X = X[:, np.newaxis, :]
+
+        if len(X) == 0:
+            return np.zeros((0, self.model.output_shape[-1]), dtype=np.float32)
+
+        step = batch_size or self.max_batch_size
+
+        return np.concatenate([
+            self._infer(X[start:start + step]).numpy()
+            for start in range(0, len(X), step)
+        ])
+
+
 if __name__ == "__main__":
     model = build_bilstm((1, 100), 3)
 
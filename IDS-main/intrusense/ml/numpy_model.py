@@ -0,0 +1,271 @@
+# numpy_model.py
+# TensorFlow-free inference for the network built by ml/model.build_bilstm:
+#   Bidirectional(LSTM(64)) -> Dropout -> Dense(64, relu) -> Dropout -> Dense(softmax)
+# Dropout is inactive at inference time, so only the LSTM and Dense
+# weights are needed.
+import os
+import sys
+import numpy as np
+
+
+# Order of the arrays inside an exported weights file
+WEIGHT_KEYS = [
+    "fwd_kernel", "fwd_recurrent_kernel", "fwd_bias",
+    "bwd_kernel", "bwd_recurrent_kernel", "bwd_bias",
+    "dense_kernel", "dense_bias",
+    "out_kernel", "out_bias",
+]
+
+
+# =================================================
+# EXPORT (reads the Keras .weights.h5 with h5py only)
+# =================================================
+def _legacy_h5_arrays(f):
+    # Keras 2 layout: one group per layer, datasets listed in "weight_names"
+    arrays = []
+    for layer in f.attrs["layer_names"]:
+        layer = layer.decode() if isinstance(layer, bytes) else layer
+        group = f[layer]
+        for name in group.attrs["weight_names"]:
+            name = name.decode() if isinstance(name, bytes) else name
+            arrays.append(np.asarray(group[name]))
+    return arrays
+
+
+def _layer_order(name):
+    # Keras numbers repeated layer names dense, dense_1, ..., dense_10 in
+    # creation order; h5py lists them alphabetically (dense_10 < dense_2)
+    base, _, suffix = name.rpartition("_")
+    if base and suffix.isdigit():
+        return (base, int(suffix))
+    return (name, 0)
+
+
+def _keras3_h5_arrays(f):
+    # Keras 3 layout: layers/<name>/.../vars/<index>. Groups are visited in
+    # model order, not h5py's alphabetical order: inside a Bidirectional
+    # layer "backward_layer" would otherwise come before "forward_layer".
+    arrays = []
+
+    def collect(group):
+        if "vars" in group:
+            vars_group = group["vars"]
+            for idx in sorted(vars_group.keys(), key=int):
+                arrays.append(np.asarray(vars_group[idx]))
+
+        children = [key for key in group.keys() if key != "vars" and hasattr(group[key], "keys")]
+        if "forward_layer" in children and "backward_layer" in children:
+            children = ["forward_layer", "backward_layer"] + [
+                key for key in children if key not in ("forward_layer", "backward_layer")
+            ]
+        else:
+            children.sort(key=_layer_order)
+
+        for key in children:
+            collect(group[key])
+
+    layers = f["layers"]
+    for layer in sorted(layers.keys(), key=_layer_order):
+        collect(layers[layer])
+    return arrays
+
+
+def read_keras_weights(weights_path):
+    import h5py
+
+    with h5py.File(weights_path, "r") as f:
+        if "layer_names" in f.attrs:
+            arrays = _legacy_h5_arrays(f)
+        else:
+            arrays = _keras3_h5_arrays(f)
+
+    if len(arrays) != len(WEIGHT_KEYS):
+        raise ValueError(
+            f"Expected {len(WEIGHT_KEYS)} weight arrays for the BiLSTM, "
+            f"found {len(arrays)} in {weights_path}"
+        )
+
+    return {key: arr.astype(np.float32) for key, arr in zip(WEIGHT_KEYS, arrays)}
+
+
+def export_weights(weights_path, out_path):
+    weights = read_keras_weights(weights_path)
+    np.savez(out_path, **weights)
+    return out_path
+
+
+def load_exported_weights(path):
+    with np.load(path) as data:
+        return {key: data[key] for key in WEIGHT_KEYS}
+
+
+# =================================================
+# QUANTIZATION
+# =================================================
+# Weight-only: kernels are stored as float16, or as int8 with one float32
+# scale per output column, and expanded inside each matmul. Biases stay
+# float32. NumPy has no int8/float16 GEMM, so activations stay float32.
+QUANTIZATION_MODES = ("float16", "int8")
+
+KERNEL_KEYS = [key for key in WEIGHT_KEYS if "kernel" in key]
+
+
+def quantize_weights(weights, mode):
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+
+    quantized = {}
+
+    for key, arr in weights.items():
+        if key not in KERNEL_KEYS:
+            quantized[key] = arr.astype(np.float32)
+        elif mode == "float16":
+            quantized[key] = arr.astype(np.float16)
+        else:
+            scale = np.max(np.abs(arr), axis=0) / 127.0
+            scale[scale == 0] = 1.0
+            quantized[key] = np.round(arr / scale).astype(np.int8)
+            quantized[key + "_scale"] = scale.astype(np.float32)
+
+    return quantized
+
+
+def weights_nbytes(weights):
+    return int(sum(arr.nbytes for arr in weights.values()))
+
+
+# =================================================
+# INFERENCE
+# =================================================
+# Rows per forward pass: bounds the gate activations' memory on big files
+PREDICT_BATCH_SIZE = 8192
+
+
+def _sigmoid(x):
+    # Same as 1 / (1 + exp(-x)), but cannot overflow for large negative x
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+def _matmul(x, weights, key):
+    # Dense matmul against a float32, float16 or int8 (+ scale) kernel
+    kernel = weights[key]
+    if kernel.dtype == np.float32:
+        return x @ kernel
+
+    out = x @ kernel.astype(np.float32)
+    scale = weights.get(key + "_scale")
+    if scale is not None:
+        out *= scale
+    return out
+
+
+def _lstm_last_state(x, w, prefix, reverse=False):
+    # x: (batch, timesteps, features); Keras gate order is i, f, c, o
+    units = w[prefix + "recurrent_kernel"].shape[0]
+    batch, timesteps, _ = x.shape
+
+    h = np.zeros((batch, units), dtype=x.dtype)
+    c = np.zeros((batch, units), dtype=x.dtype)
+
+    steps = range(timesteps - 1, -1, -1) if reverse else range(timesteps)
+
+    for t in steps:
+        z = _matmul(x[:, t, :], w, prefix + "kernel") + w[prefix + "bias"]
+        if t != steps[0]:
+            z += _matmul(h, w, prefix + "recurrent_kernel")
+
+        i = _sigmoid(z[:, :units])
+        f = _sigmoid(z[:, units:2 * units])
+        g = np.tanh(z[:, 2 * units:3 * units])
+        o = _sigmoid(z[:, 3 * units:])
+
+        c = f * c + i * g
+        h = o * np.tanh(c)
+
+    return h
+
+
+def _softmax(x):
+    x = x - np.max(x, axis=1, keepdims=True)
+    e = np.exp(x)
+    return e / np.sum(e, axis=1, keepdims=True)
+
+
+class NumpyBiLSTM:
+    """Drop-in replacement for the Keras model's ``predict``."""
+
+    def __init__(self, weights, quantization=None):
+        if quantization:
+            weights = quantize_weights(weights, quantization)
+        self.weights = weights
+        self.quantization = quantization
+
+    @classmethod
+    def from_weights_file(cls, path, quantization=None):
+        if str(path).endswith(".npz"):
+            return cls(load_exported_weights(path), quantization)
+        return cls(read_keras_weights(path), quantization)
+
+    def _forward(self, X):
+        w = self.weights
+
+        fwd = _lstm_last_state(X, w, "fwd_")
+        bwd = _lstm_last_state(X, w, "bwd_", reverse=True)
+
+        h = np.concatenate([fwd, bwd], axis=1)
+        h = np.maximum(_matmul(h, w, "dense_kernel") + w["dense_bias"], 0.0)
+
+        return _softmax(_matmul(h, w, "out_kernel") + w["out_bias"])
+
+    def predict(self, X, verbose=0, batch_size=None):
+        X = np.asarray(X)
+        if X.ndim == 2:
+            X = X[:, np.newaxis, :]
+
+        step = batch_size or PREDICT_BATCH_SIZE
+        out = np.empty((len(X), self.weights["out_bias"].shape[-1]), dtype=np.float32)
+
+        for start in range(0, len(X), step):
+            block = np.asarray(X[start:start + step], dtype=np.float32)
+            out[start:start + step] = self._forward(block)
+
+        return out
+
+
+class NumpyMLP:
+    """Distilled student (see ml/distill.py): ReLU Dense layers, softmax output."""
+
+    def __init__(self, layers):
+        self.layers = [(np.asarray(k, np.float32), np.asarray(b, np.float32)) for k, b in layers]
+
+    @classmethod
+    def from_file(cls, path):
+        with np.load(path) as data:
+            n_layers = len([key for key in data.files if key.startswith("kernel_")])
+            return cls([(data[f"kernel_{i}"], data[f"bias_{i}"]) for i in range(n_layers)])
+
+    def save(self, path):
+        arrays = {}
+        for i, (kernel, bias) in enumerate(self.layers):
+            arrays[f"kernel_{i}"] = kernel
+            arrays[f"bias_{i}"] = bias
+        np.savez(path, **arrays)
+
+    def predict(self, X, verbose=0, batch_size=None):
+        h = np.asarray(X, dtype=np.float32).reshape(len(X), -1)
+
+        for kernel, bias in self.layers[:-1]:
+            h = np.maximum(h @ kernel + bias, 0.0)
+
+        kernel, bias = self.layers[-1]
+        return _softmax(h @ kernel + bias)
+
+
+if __name__ == "__main__":
+    # python ml/numpy_model.py <weights.h5> [out.npz]
+    src = sys.argv[1] if len(sys.argv) > 1 else "bilstm_ids.weights.h5"
+    dst = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(os.path.splitext(src)[0])[0] + ".npz"
+
+    export_weights(src, dst)
+
+    print(f"Exported {src} -> {dst}")
@@ -0,0 +1,194 @@
+# prepare_dataset.py
+# Out-of-core training data preparation, for corpora that do not fit in
+# RAM (e.g. months of captured sessions rather than one NSL-KDD file).
+#
+# Pass 1 streams every CSV in chunks to find the category vocabulary, the
+# label classes and the scaler statistics (incremental mean/variance for
+# numeric columns, category counts for the one-hot columns).
+# Pass 2 streams them again and writes scaled float32 features and encoded
+# labels chunk by chunk into memory-mapped .npy files.
+#
+# The result matches load_and_preprocess(training=True) on the same rows:
+# same column order as get_dummies, same StandardScaler statistics.
+#
+# Run from the intrusense/ directory:
+#     python -m ml.prepare_dataset OUT_DIR data1.csv [data2.csv ...] [--chunksize 100000]
+# Then train with IDS_PREPARED_DIR=OUT_DIR python train.py (from ml/).
+import argparse
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from numpy.lib.format import open_memmap
+
+try:
+    from ml.feature_plan import CATEGORICAL_FIELDS, FEATURE_DTYPE, build_feature_plan, apply_plan, scale_inplace
+    from ml.preprocessing import map_attack_series
+except ImportError:  # run from inside ml/ (train.py)
+    from feature_plan import CATEGORICAL_FIELDS, FEATURE_DTYPE, build_feature_plan, apply_plan, scale_inplace
+    from preprocessing import map_attack_series
+
+PREPARE_CHUNK_SIZE = 100_000
+
+NON_FEATURE_COLUMNS = ("label", "difficulty")
+
+FEATURES_FILE = "features.npy"
+LABELS_FILE = "labels.npy"
+MANIFEST_FILE = "manifest.json"
+
+
+def _iter_chunks(paths, chunksize):
+    for path in paths:
+        for chunk in pd.read_csv(path, header=0, chunksize=chunksize):
+            yield chunk
+
+
+# =================================================
+# PASS 1: VOCABULARY, CLASSES, SCALER STATISTICS
+# =================================================
+def scan_dataset(paths, chunksize=PREPARE_CHUNK_SIZE):
+    from sklearn.preprocessing import StandardScaler
+
+    numeric_names = None
+    numeric_stats = StandardScaler()
+    category_counts = {field: {} for field in CATEGORICAL_FIELDS}
+    classes = set()
+    n_rows = 0
+
+    for chunk in _iter_chunks(paths, chunksize):
+        if numeric_names is None:
+            numeric_names = [
+                c for c in chunk.columns
+                if c not in NON_FEATURE_COLUMNS and c not in CATEGORICAL_FIELDS
+            ]
+
+        # NaN-aware, numerically stable merge of per-chunk moments
+        numeric_stats.partial_fit(chunk[numeric_names].to_numpy(dtype=np.float64))
+
+        for field in CATEGORICAL_FIELDS:
+            counts = category_counts[field]
+            for value, count in chunk[field].dropna().astype(str).value_counts().items():
+                counts[value] = counts.get(value, 0) + int(count)
+
+        classes.update(map_attack_series(chunk["label"]).unique())
+        n_rows += len(chunk)
+
+    if numeric_names is None:
+        raise ValueError("No rows found in the input files")
+
+    # get_dummies layout: remaining columns in file order, then one block
+    # per categorical field with its categories sorted
+    columns = list(numeric_names)
+    means = [numeric_stats.mean_]
+    variances = [numeric_stats.var_]
+
+    for field in CATEGORICAL_FIELDS:
+        values = sorted(category_counts[field])
+        p = np.array([category_counts[field][v] for v in values], dtype=np.float64) / n_rows
+        columns += [f"{field}_{v}" for v in values]
+        means.append(p)
+        variances.append(p * (1 - p))
+
+    return {
+        "rows": n_rows,
+        "training_columns": columns,
+        "mean": np.concatenate(means),
+        "var": np.concatenate(variances),
+        "classes": sorted(classes),
+    }
+
+
+def build_scaler(scan):
+    from sklearn.preprocessing import StandardScaler
+
+    var = scan["var"]
+    scale = np.sqrt(var)
+    scale[scale < 10 * np.finfo(scale.dtype).eps] = 1.0   # as StandardScaler does
+
+    scaler = StandardScaler()
+    scaler.mean_ = scan["mean"]
+    scaler.var_ = var
+    scaler.scale_ = scale
+    scaler.n_samples_seen_ = scan["rows"]
+    scaler.n_features_in_ = len(scan["training_columns"])
+    scaler.feature_names_in_ = np.asarray(scan["training_columns"], dtype=object)
+    return scaler
+
+
+def build_label_encoder(scan):
+    from sklearn.preprocessing import LabelEncoder
+
+    label_encoder = LabelEncoder()
+    label_encoder.classes_ = np.asarray(scan["classes"], dtype=object)
+    return label_encoder
+
+
+# =================================================
+# PASS 2: SCALED FLOAT32 SHARDS
+# =================================================
+def prepare_dataset(paths, out_dir, chunksize=PREPARE_CHUNK_SIZE):
+    os.makedirs(out_dir, exist_ok=True)
+
+    scan = scan_dataset(paths, chunksize)
+    scaler = build_scaler(scan)
+    label_encoder = build_label_encoder(scan)
+    training_columns = scan["training_columns"]
+    plan = build_feature_plan(training_columns)
+
+    n_rows = scan["rows"]
+    X = open_memmap(os.path.join(out_dir, FEATURES_FILE), mode="w+", dtype=FEATURE_DTYPE, shape=(n_rows, len(training_columns)))
+    y = open_memmap(os.path.join(out_dir, LABELS_FILE), mode="w+", dtype=np.int64, shape=(n_rows,))
+
+    offset = 0
+    for chunk in _iter_chunks(paths, chunksize):
+        stop = offset + len(chunk)
+
+        X[offset:stop] = scale_inplace(apply_plan(plan, chunk), scaler)
+        y[offset:stop] = label_encoder.transform(map_attack_series(chunk["label"], on_unknown="ignore"))
+
+        offset = stop
+
+    X.flush()
+    y.flush()
+    del X, y
+
+    joblib.dump(scaler, os.path.join(out_dir, "scaler.pkl"))
+    joblib.dump(label_encoder, os.path.join(out_dir, "label_encoder.pkl"))
+    joblib.dump(training_columns, os.path.join(out_dir, "training_columns.pkl"))
+
+    manifest = {
+        "rows": n_rows,
+        "features": len(training_columns),
+        "dtype": np.dtype(FEATURE_DTYPE).name,
+        "classes": scan["classes"],
+        "sources": [os.path.abspath(p) for p in paths],
+    }
+    with open(os.path.join(out_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=4)
+
+    return manifest
+
+
+def load_prepared(out_dir):
+    # Same tuple as load_and_preprocess(training=True); X and y are
+    # read-only memory maps, so only the pages in use are resident
+    return (
+        np.load(os.path.join(out_dir, FEATURES_FILE), mmap_mode="r"),
+        np.load(os.path.join(out_dir, LABELS_FILE), mmap_mode="r"),
+        joblib.load(os.path.join(out_dir, "scaler.pkl")),
+        joblib.load(os.path.join(out_dir, "label_encoder.pkl")),
+        joblib.load(os.path.join(out_dir, "training_columns.pkl")),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("out_dir")
+    parser.add_argument("csv", nargs="+")
+    parser.add_argument("--chunksize", type=int, default=PREPARE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    manifest = prepare_dataset(args.csv, args.out_dir, args.chunksize)
+    print(f"Prepared {manifest['rows']:,} rows x {manifest['features']} features in {args.out_dir}")
@@ -1,73 +1,158 @@
+import warnings
+from contextlib import nullcontext
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler, LabelEncoder
 
-def map_attack(x):
-    x = str(x).lower().strip()
+try:
+    from ml.feature_plan import FEATURE_DTYPE, build_feature_plan, apply_plan, scale_inplace
+except ImportError:  # run from inside ml/ (train.py, admin "Run Preprocessing")
+    from feature_plan import FEATURE_DTYPE, build_feature_plan, apply_plan, scale_inplace
+
+try:
+    from ml.ingest import read_typed
+except ImportError:
+    from ingest import read_typed
+
 
-    # Normal Traffic
-    if x == "normal":
-        return "Normal"
+def _no_stage(name):
+    return nullcontext()
 
+# Raw NSL-KDD attack names per class, also used by common/live_capture.py
+# to simulate attacks of a given class
+ATTACK_LABELS = {
     # Denial of Service (DoS) Attacks
-    elif x in [
+    "DoS": [
         "neptune", "smurf", "teardrop", "pod", "land", "back",
         "apache2", "processtable", "udpstorm", "mailbomb"
-    ]:
-        return "DoS"
+    ],
 
     # Probe / Reconnaissance Attacks
-    elif x in [
+    "Probe": [
         "satan", "ipsweep", "portsweep", "nmap", "mscan", "saint"
-    ]:
-        return "Probe"
+    ],
 
     # Remote to Local (R2L) Attacks
-    elif x in [
+    "R2L": [
         "ftp_write", "imap", "multihop", "phf", "spy",
         "warezclient", "warezmaster", "sendmail", "named", "snmpgetattack",
         "snmpguess", "worm", "xlock", "xsnoop"
-    ]:
-        return "R2L"
+    ],
 
     # User to Root (U2R) Attacks
-    elif x in [
+    "U2R": [
         "buffer_overflow", "guess_passwd","loadmodule", "perl", "rootkit", "sqlattack", "xterm", "ps"
-    ]:
-        return "U2R"
+    ],
+}
 
-    # Fallback (for any unknown labels)
-    else:
-        return "Normal"
+# Normalised raw label -> class, one dict lookup per distinct label
+LABEL_LOOKUP = {"normal": "Normal"}
+for _category, _labels in ATTACK_LABELS.items():
+    LABEL_LOOKUP.update(dict.fromkeys(_labels, _category))
 
-def load_and_preprocess(filepath, training=True, scaler=None, label_encoder=None, training_columns=None, has_header=True):
-    # Read CSV (with headers if has_header=True)
-    if has_header:
-        df = pd.read_csv(filepath, header=0)
-    else:
+# Class used for labels that are not in LABEL_LOOKUP
+UNKNOWN_LABEL_CLASS = "Normal"
+
+
+def map_attack(x):
+    return LABEL_LOOKUP.get(str(x).lower().strip(), UNKNOWN_LABEL_CLASS)
+
+def map_attack_series(labels, on_unknown="warn"):
+    # Vectorised map_attack: labels are factorised, only the distinct values
+    # are normalised and looked up, and the codes broadcast the result back.
+    # on_unknown: "warn" (default) or "ignore" maps unknown labels to
+    # UNKNOWN_LABEL_CLASS; "raise" raises ValueError listing them.
+    labels = pd.Series(labels)
+    codes, uniques = pd.factorize(labels, use_na_sentinel=False)
+
+    keys = pd.Index([str(x).lower().strip() for x in uniques], dtype=object)
+    classes = keys.map(LABEL_LOOKUP)
+
+    missing = pd.isna(classes)
+    if missing.any():
+        unknown = sorted(set(keys[missing]))
+        n_rows = int(np.isin(codes, np.flatnonzero(missing)).sum())
+        message = f"{n_rows} rows have unknown labels {unknown}"
+
+        if on_unknown == "raise":
+            raise ValueError(message)
+        if on_unknown == "warn":
+            warnings.warn(f"{message}; mapped to {UNKNOWN_LABEL_CLASS}", stacklevel=2)
+
+    classes = np.asarray(classes.fillna(UNKNOWN_LABEL_CLASS), dtype=object)
+
+    return pd.Series(classes[codes], index=labels.index, name=labels.name)
+
+def preprocess_features(df, scaler, training_columns, stage=_no_stage):
+    # Feature-only path for one frame or chunk: labels are ignored, columns
+    # are aligned to the training layout and scaled with the fitted scaler.
+    # stage(name) is an optional timing context (see common/metrics.py).
+    # Label/difficulty are simply not part of the plan, so no drop is needed
+    with stage("feature_plan"):
+        X = apply_plan(build_feature_plan(training_columns), df)
+
+    with stage("scale"):
+        return scale_inplace(X, scaler)
+
+def read_frame(source, has_header=True, training_columns=None, keep_columns=False):
+    # Accepts a CSV/Parquet path, an already-parsed DataFrame, raw bytes or
+    # a file-like object (e.g. Streamlit's UploadedFile). Files are parsed
+    # with the typed schema from ml/ingest.py; columns outside it are only
+    # kept with keep_columns=True.
+    if not has_header:
         raise ValueError("Your file is CSV with headers. Please set has_header=True.")
 
-    # Drop difficulty if exists
-    if "difficulty" in df.columns:
-        df = df.drop(columns=["difficulty"])
+    if isinstance(source, pd.DataFrame):
+        return source
+
+    return read_typed(source, training_columns, keep_columns=keep_columns)
+
+# load_and_preprocess modes:
+#   "train"     fit scaler/encoder/columns on a labelled file
+#   "evaluate"  transform with fitted objects; labels are mapped and encoded
+#   "inference" transform with fitted objects; labels are neither needed
+#               nor read, and y is None
+PREPROCESS_MODES = ("train", "evaluate", "inference")
+
+
+def load_and_preprocess(filepath, training=True, scaler=None, label_encoder=None, training_columns=None, has_header=True, stage=_no_stage, mode=None):
+    # filepath may be anything read_frame accepts; a DataFrame is used
+    # directly and is never modified. Without mode, training=True means
+    # "train" and training=False means "evaluate", as before.
+    if mode is None:
+        mode = "train" if training else "evaluate"
+    if mode not in PREPROCESS_MODES:
+        raise ValueError(f"Unknown preprocessing mode: {mode}")
+
+    with stage("parse"):
+        df = read_frame(filepath, has_header=has_header, training_columns=training_columns)
+
+    if mode == "inference":
+        return preprocess_features(df, scaler, training_columns, stage=stage), None, None, None, None
+
+    if "label" not in df.columns:
+        raise ValueError(f"{mode} mode needs a 'label' column; use mode=\"inference\" for unlabelled traffic")
 
     # Map attack labels
-    df["label"] = df["label"].apply(map_attack)
+    with stage("map_labels"):
+        y = map_attack_series(df["label"])
+
+    if mode == "train":
+        # Imported here so label helpers such as map_attack stay lightweight
+        from sklearn.preprocessing import StandardScaler, LabelEncoder
 
-    # Split features and labels
-    X = df.drop("label", axis=1)
-    y = df["label"]
+        # Split features and labels (drop difficulty if exists)
+        X = df.drop(columns=[c for c in ("label", "difficulty") if c in df.columns])
 
-    # One-hot encode categorical features
-    X = pd.get_dummies(X, columns=["protocol_type","service","flag"])
+        # One-hot encode categorical features
+        with stage("get_dummies"):
+            X = pd.get_dummies(X, columns=["protocol_type","service","flag"])
 
-    if training:
         # Save training columns
         training_columns = X.columns
 
         # Scale numerical values
         scaler = StandardScaler()
-        X = scaler.fit_transform(X)
+        X = scaler.fit_transform(X).astype(FEATURE_DTYPE, copy=False)
 
         # Encode labels
         label_encoder = LabelEncoder()
@@ -76,13 +161,42 @@ def load_and_preprocess(filepath, training=True, scaler=None, label_encoder=None
         return X, y, scaler, label_encoder, list(training_columns)
 
     else:
-        # Reindex with training columns (align test data with train structure)
-        X = X.reindex(columns=training_columns, fill_value=0)
+        # One-hot encode straight into the training column layout with the
+        # precompiled plan (same result as get_dummies + reindex)
+        with stage("feature_plan"):
+            X = apply_plan(build_feature_plan(training_columns), df)
 
         # Scale using trained scaler
-        X = scaler.transform(X)
+        with stage("scale"):
+            X = scale_inplace(X, scaler)
 
         # Encode labels
-        y = label_encoder.transform(y)
+        with stage("label_encode"):
+            y = label_encoder.transform(y)
 
         return X, y, None, None, None
+
+
+if __name__ == "__main__":
+    # Admin "Run Preprocessing": preprocess the training file into the
+    # dataset cache so the next train.py run starts from it
+    #     python ml/preprocessing.py [train.csv]
+    import os
+    import sys
+    import time
+
+    try:
+        from ml.dataset_cache import cached_load_and_preprocess
+    except ImportError:
+        from dataset_cache import cached_load_and_preprocess
+
+    train_file = sys.argv[1] if len(sys.argv) > 1 else os.environ.get(
+        "IDS_TRAIN_FILE", "C:/OneDrive/Desktop/NEWP/Data/nsl-kdd/KDDTrain+.csv"
+    )
+
+    start = time.perf_counter()
+    X, y, scaler, label_encoder, training_columns, from_cache = cached_load_and_preprocess(train_file)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'Loaded from cache' if from_cache else 'Preprocessed and cached'} in {elapsed:.2f}s")
+    print(f"Rows: {X.shape[0]}  Features: {X.shape[1]}  Classes: {list(label_encoder.classes_)}")
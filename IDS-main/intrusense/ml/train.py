@@ -1,19 +1,46 @@
+import os
+import sys
 import joblib
+import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Dense, LSTM, Bidirectional, Dropout
-from preprocessing import load_and_preprocess
+from dataset_cache import cached_load_and_preprocess
+from prepare_dataset import load_prepared
+from cascade import train_stage1
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
 import numpy as np
 
-train_file = "C:/OneDrive/Desktop/NEWP/Data/nsl-kdd/KDDTrain+.csv"
+try:
+    from common.detection_utlis import CASCADE_PATH
+except ImportError:  # run from inside ml/: make intrusense/ importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from common.detection_utlis import CASCADE_PATH
+
+train_file = os.environ.get("IDS_TRAIN_FILE", "C:/OneDrive/Desktop/NEWP/Data/nsl-kdd/KDDTrain+.csv")
+
+# Directory written by prepare_dataset.py: train out of core on its
+# memory-mapped features instead of loading train_file into RAM
+prepared_dir = os.environ.get("IDS_PREPARED_DIR")
 
 # Load and preprocess
-X_train, y_train, scaler, label_encoder, training_columns = load_and_preprocess(
-    train_file, training=True, has_header=True
-)
+if prepared_dir:
+    X_train, y_train, scaler, label_encoder, training_columns = load_prepared(prepared_dir)
+else:
+    # Reuses the arrays and transformers from an earlier run on the same
+    # file contents (see dataset_cache.py)
+    X_train, y_train, scaler, label_encoder, training_columns, from_cache = cached_load_and_preprocess(
+        train_file, has_header=True
+    )
+    print("Preprocessed data loaded from cache" if from_cache else "Preprocessed data cached")
 
 num_classes = len(label_encoder.classes_)
 
+# Stage-1 cascade classifier on the same features (see cascade.py), fitted
+# in memory on at most STAGE1_MAX_ROWS evenly spread rows
+STAGE1_MAX_ROWS = 500_000
+stage1_rows = np.linspace(0, len(X_train) - 1, min(len(X_train), STAGE1_MAX_ROWS)).astype(int)
+stage1 = train_stage1(np.asarray(X_train[stage1_rows]), np.asarray(y_train[stage1_rows]))
+
 # Reshape input for BiLSTM
 X_train = X_train.reshape(X_train.shape[0], 1, X_train.shape[1])
 
@@ -29,23 +56,54 @@ model.add(Dense(num_classes, activation='softmax'))
 model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
 model.summary()
 
+class MemmapBatches(tf.keras.utils.Sequence):
+    # Reads one batch at a time from the memory-mapped arrays
+    def __init__(self, X, y, batch_size, start, stop):
+        super().__init__()
+        self.X, self.y = X, y
+        self.batch_size, self.start, self.stop = batch_size, start, stop
+
+    def __len__(self):
+        return -(-(self.stop - self.start) // self.batch_size)
+
+    def __getitem__(self, idx):
+        lo = self.start + idx * self.batch_size
+        hi = min(lo + self.batch_size, self.stop)
+        return np.asarray(self.X[lo:hi]), np.asarray(self.y[lo:hi])
+
+
 # ✅ Train model using integer labels (no to_categorical)
-history = model.fit(
-    X_train, y_train,
-    epochs=3,
-    batch_size=128,
-    validation_split=0.1,
-    verbose=2
-)
+if prepared_dir:
+    # Same split as validation_split=0.1: the last 10% of rows
+    split = int(len(X_train) * 0.9)
+    history = model.fit(
+        MemmapBatches(X_train, y_train, 128, 0, split),
+        validation_data=MemmapBatches(X_train, y_train, 128, split, len(X_train)),
+        epochs=3,
+        verbose=2
+    )
+else:
+    history = model.fit(
+        X_train, y_train,
+        epochs=3,
+        batch_size=128,
+        validation_split=0.1,
+        verbose=2
+    )
 
 # Save everything
 model.save("bilstm_ids.keras")
 joblib.dump(scaler, "scaler.pkl")
 joblib.dump(label_encoder, "label_encoder.pkl")
 joblib.dump(training_columns, "training_columns.pkl")
+# Where detection_utlis looks for it, whatever the working directory
+joblib.dump(stage1, CASCADE_PATH)
 
 # Evaluation
-y_train_pred = model.predict(X_train)
+if prepared_dir:
+    y_train_pred = model.predict(MemmapBatches(X_train, y_train, 4096, 0, len(X_train)))
+else:
+    y_train_pred = model.predict(X_train)
 y_train_pred_classes = np.argmax(y_train_pred, axis=1)
 
 print("\n=== Training Evaluation Metrics ===")
@@ -16,6 +16,9 @@ from database import (
     update_user_status,
     delete_user
 )
+from common.prediction_cache import prediction_cache
+from common.inference_server import server_stats
+from common.metrics import metrics_registry
 
 # ======================================================
 # PAGE CONFIG
@@ -322,7 +325,7 @@ st.markdown("""
 # DASHBOARD CARDS (CENTER)
 # ======================================================
 if st.session_state.admin_view is None:
-    c1, c2, c3 = st.columns(3)
+    c1, c2, c3, c4 = st.columns(4)
 
     # -------- MODEL TRAINING CARD --------
     with c1:
@@ -363,6 +366,19 @@ if st.session_state.admin_view is None:
             st.session_state.admin_view = "logs"
             st.rerun()
 
+    # -------- INFERENCE CARD --------
+    with c4:
+        st.markdown("""
+        <div class="glass" style="text-align:center;">
+            <h2>⚡ Inference</h2>
+            <p>Prediction cache and model serving stats</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        if st.button("Open Inference Stats", use_container_width=True):
+            st.session_state.admin_view = "inference"
+            st.rerun()
+
 # ================= BACK BUTTON =================
 if st.session_state.admin_view is not None:
     if st.button("⬅ Back to Dashboard"):
@@ -450,6 +466,78 @@ if st.session_state.admin_view == "logs":
 
         st.markdown('</div>', unsafe_allow_html=True)
 
+# ================= INFERENCE =================
+if st.session_state.admin_view == "inference":
+    col1, col2, col3 = st.columns([1, 4, 1])
+
+    with col2:
+        st.markdown('<div class="glass">', unsafe_allow_html=True)
+        st.subheader("⚡ Prediction Cache")
+
+        cache_stats = prediction_cache.stats()
+
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Hits", cache_stats["hits"])
+        m2.metric("Misses", cache_stats["misses"])
+        m3.metric("Hit Rate", f"{cache_stats['hit_rate'] * 100:.1f}%")
+        m4.metric("Entries", f"{cache_stats['size']} / {cache_stats['maxsize']}")
+
+        st.caption(
+            f"Evictions: {cache_stats['evictions']} • "
+            f"Rounding: {cache_stats['decimals'] if cache_stats['decimals'] is not None else 'exact'}"
+        )
+
+        if st.button("Clear Prediction Cache", key="btn_clear_cache"):
+            prediction_cache.clear()
+            prediction_cache.reset_stats()
+            st.success("Prediction cache cleared")
+            st.rerun()
+
+        st.subheader("🧵 Inference Server")
+
+        serving = server_stats()
+
+        if serving is None:
+            st.info("Inference server not started yet (no predictions in this process).")
+        else:
+            s1, s2, s3, s4 = st.columns(4)
+            s1.metric("Requests", serving["requests"])
+            s2.metric("Batches", serving["batches"])
+            s3.metric("Requests / Batch", serving["avg_requests_per_batch"])
+            s4.metric("Largest Batch (rows)", serving["largest_batch"])
+
+            st.caption(
+                f"Status: {'running' if serving['running'] else 'stopped'} • "
+                f"Queued: {serving['queued']} • Rows scored: {serving['rows']}"
+            )
+
+        st.subheader("⏱ Detection Pipeline Timings")
+
+        pipelines = metrics_registry.pipelines()
+
+        if not pipelines:
+            st.info("No detection calls recorded in this process yet.")
+        else:
+            pipeline = st.selectbox("Pipeline", pipelines, key="metrics_pipeline")
+
+            throughput = metrics_registry.throughput(pipeline)
+            t1, t2, t3 = st.columns(3)
+            t1.metric("Recent Calls", throughput["calls"])
+            t2.metric("Rows", throughput["rows"])
+            t3.metric("Rows / Second", throughput["rows_per_second"])
+
+            st.dataframe(
+                pd.DataFrame(metrics_registry.summary(pipeline)),
+                use_container_width=True,
+                hide_index=True
+            )
+
+            if st.button("Reset Timings", key="btn_reset_metrics"):
+                metrics_registry.clear()
+                st.rerun()
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
 import re
 
 def parse_model_summary(summary_text):
@@ -10,7 +10,7 @@ import numpy as np
 
 from common.sidebar import render_user_sidebar
 from common.session import require_login
-from common.detection_utlis import detect_severity
+from common.severity import detect_severity
 from common.live_capture import live_packet_stream
 from common.log_utils import start_new_session, save_log
 
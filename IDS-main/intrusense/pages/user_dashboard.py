@@ -6,7 +6,7 @@ from datetime import datetime
 from common.session import require_login, require_role
 from common.sidebar import render_user_sidebar
 from common.log_utils import list_sessions
-from common.detection_utlis import detect_severity
+from common.severity import detect_severity
 
 
 # ================= PAGE CONFIG =================